@@ -2,207 +2,2177 @@
 # BAGIAN 1: IMPORT LIBRARY (MEMANGGIL ALAT-ALAT YANG DIBUTUHKAN)
 # ==============================================================================
 
+import time                             # Mengukur lama proses (telemetri PageRank & waktu import).
+_import_started = time.perf_counter()   # Awal import: dipakai untuk melaporkan waktu import saat start.
 import streamlit as st                  # Library utama untuk membuat tampilan Web App (UI/Antarmuka).
-import fitz  # PyMuPDF                  # Library khusus untuk membuka dan membaca teks dari dalam file PDF.
-import nltk                             # Natural Language Toolkit: Otak kecerdasan buatan untuk memproses bahasa manusia.
-from nltk.corpus import stopwords       # Mengambil daftar "kata sampah" (seperti: dan, yang, di, ke) untuk dibuang.
-from nltk.tokenize import word_tokenize # Alat untuk memotong kalimat panjang menjadi potongan kata-kata (token).
-import pandas as pd                     # Library untuk membuat tabel data yang rapi dan bisa diurutkan (seperti Excel).
-import networkx as nx                   # Library matematika untuk menghitung hubungan antar titik (Graph) dan algoritma PageRank.
-from pyvis.network import Network       # Library untuk memvisualisasikan Graph agar bisa digerakkan/interaktif di web.
-import tempfile                         # Library untuk membuat file sementara di sistem (karena PyMuPDF butuh file fisik, bukan di RAM).
+import numpy as np                      # Array angka yang cepat, dipakai untuk menghitung pasangan kata tanpa loop Python.
 import re                               # Regex (Regular Expression): Alat pencari pola teks (misal: mencari dan menghapus semua angka).
-import streamlit.components.v1 as components # Komponen penghubung agar kode HTML (hasil graph) bisa muncul di dalam Streamlit.
-import os                               # Library untuk berinteraksi dengan sistem operasi (seperti perintah menghapus file).
+import os                               # Library untuk berinteraksi dengan sistem operasi (seperti menghitung jumlah CPU).
+import concurrent.futures               # Pool proses untuk mengekstrak halaman PDF secara paralel di beberapa core CPU.
+import hashlib                          # Membuat "sidik jari" (hash) isi PDF sebagai kunci cache.
+import struct                           # Menulis/membaca header biner file cache.
+import tempfile                         # Membuat file sementara agar penulisan cache bersifat atomik.
+import zlib                             # Mengompres isi cache supaya hemat ruang disk.
+import threading                        # Kunci (lock) agar cache bersama aman dipakai banyak sesi sekaligus.
+from collections import OrderedDict, deque  # OrderedDict: cache LRU; deque: antrian job upload per sesi.
+import contextlib                       # Membuat "with track_stage(...)" untuk mengukur satu tahap.
+import importlib                        # Memuat library berat saat dibutuhkan & hook profiler eksternal (PPW_STAGE_HOOKS).
+import json                             # Menulis log tahap dalam format JSON Lines.
+import logging                          # Penulisan log ke file...
+from logging.handlers import RotatingFileHandler  # ...yang otomatis diganti (rotate) jika sudah terlalu besar.
+import tracemalloc                      # Mengukur puncak memori Python per tahap (opsional, saat diagnostik aktif).
+import uuid                             # ID unik untuk setiap rerun.
+import sys                              # Perkiraan ukuran objek (string kosakata) untuk batas memori sesi.
+import mmap                             # Membaca file edge list besar langsung dari disk (memory-mapped).
+import io                               # Membungkus potongan edge list (bytes) sebagai file untuk np.loadtxt.
+import warnings                         # Mengubah peringatan parser NumPy menjadi error (edge list rusak).
+try:
+    import resource                     # Puncak memori proses (RSS). Hanya ada di Linux/macOS.
+except ImportError:
+    resource = None
+
+# Library berat dimuat MALAS (lazy): import baru terjadi saat tahap yang membutuhkannya pertama kali
+# berjalan (misal PyMuPDF saat PDF pertama dibaca, PyVis saat graph pertama digambar), bukan saat
+# aplikasi start. Lama import tercatat sebagai tahap "import:<nama modul>" di log/diagnostik.
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        # Hanya dipanggil untuk atribut yang bukan milik LazyModule sendiri (misal pd.DataFrame).
+        module = self._module
+        if module is None:
+            module = self._module = self._load()
+        return getattr(module, attr)
+
+    def _load(self):
+        if self._name in sys.modules:
+            # Bisa jadi modul ini sedang di-import oleh thread lain (misal dua worker antrian upload
+            # membuka PDF bersamaan): import_module menunggu sampai import itu selesai.
+            return importlib.import_module(self._name)
+        with track_stage(f"import:{self._name}"):
+            return importlib.import_module(self._name)
+
+fitz = LazyModule("fitz")               # PyMuPDF: membuka dan membaca teks dari dalam file PDF.
+nltk = LazyModule("nltk")               # Natural Language Toolkit: hanya untuk membuat/mengunduh resource bahasa.
+pd = LazyModule("pandas")               # Tabel data yang rapi dan bisa diurutkan (seperti Excel).
+sp = LazyModule("scipy.sparse")         # Matriks jarang (sparse): hanya menyimpan pasangan kata yang benar-benar muncul.
+nx = LazyModule("networkx")             # Graph (node & edge) dan layout posisi node.
+pyvis_network = LazyModule("pyvis.network")  # Visualisasi Graph interaktif di web (pyvis_network.Network).
+components = LazyModule("streamlit.components.v1")  # Menampilkan HTML graph di dalam Streamlit.
+
+# Lama import modul-modul di atas (detik) pada eksekusi skrip ini.
+IMPORT_SECONDS = time.perf_counter() - _import_started
 
 # ==============================================================================
 # BAGIAN 2: KONFIGURASI HALAMAN WEB
 # ==============================================================================
 
 # Mengatur judul yang muncul di tab browser dan mengatur agar layout memenuhi layar (wide mode).
-st.set_page_config(page_title="Analisis Paper Dinamis", layout="wide") 
+# Dipanggil dari main(), supaya file ini juga bisa di-import tanpa UI (misal oleh batch.py).
+def configure_page():
+    st.set_page_config(page_title="Analisis Paper Dinamis", layout="wide") 
 
 # ==============================================================================
-# BAGIAN 3: FUNGSI DOWNLOAD RESOURCE BAHASA (CACHE)
+# BAGIAN 3: RESOURCE BAHASA (STOPWORDS & TOKENIZER) TANPA INTERNET
 # ==============================================================================
 
+# Resource bahasa dibaca dari artefak lokal yang ikut di repository/image (nlp_resources.json):
+# start aplikasi tidak membuka koneksi internet dan bahkan tidak perlu meng-import NLTK.
+# Artefak dibuat ulang dari data NLTK dengan: python pack_resources.py --download
+NLP_RESOURCES_PATH = os.environ.get(
+    "PPW_NLP_RESOURCES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "nlp_resources.json")
+)
+NLP_RESOURCES_FORMAT = 1
+# Jika artefak tidak ada, data NLTK yang belum terpasang diunduh (perilaku lama). Isi "0" untuk
+# server tanpa internet supaya tidak menunggu koneksi yang pasti gagal.
+NLTK_DOWNLOAD = os.environ.get("PPW_NLTK_DOWNLOAD", "1") != "0"
+
 # @st.cache_resource adalah perintah agar fungsi ini hanya dijalankan SEKALI saja saat aplikasi pertama dibuka.
 # Tujuannya agar tidak download data bahasa berulang-ulang setiap kali user klik tombol (biar tidak lemot).
+# Sekarang hanya dipakai sebagai cadangan jika artefak nlp_resources.json tidak ada.
 @st.cache_resource
 def download_nltk_data():
-    # Membuat daftar paket bahasa dasar NLTK yang wajib ada.
-    resources = ['punkt', 'stopwords', 'punkt_tab']
+    # Membuat daftar paket bahasa dasar NLTK yang wajib ada (lokasinya di folder data NLTK).
+    resources = {'punkt': 'tokenizers/punkt', 'punkt_tab': 'tokenizers/punkt_tab', 'stopwords': 'corpora/stopwords'}
     
     # Melakukan perulangan (loop) untuk mengecek satu per satu paket di atas.
-    for res in resources:
+    for res, location in resources.items():
         try:
             # Mencoba mencari: Apakah paket ini sudah ada di folder komputer server?
-            nltk.data.find(f'tokenizers/{res}')
+            nltk.data.find(location)
         except LookupError:
             # Jika komputer bilang "Error/Gak ketemu", maka download paketnya secara diam-diam (quiet=True).
             nltk.download(res, quiet=True)
-            
-    # Pengecekan ekstra khusus untuk folder 'stopwords' agar tidak error.
+
+# Membaca artefak resource bahasa. Mengembalikan {'stopwords': [...], 'split_contractions': bool},
+# atau None jika file tidak ada / formatnya tidak dikenal.
+def load_packed_nlp_resources(path=NLP_RESOURCES_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            packed = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if packed.get("format") != NLP_RESOURCES_FORMAT:
+        return None
+    return {'stopwords': packed['stopwords']['indonesian'], 'split_contractions': packed['split_contractions']}
+
+# Mengambil resource yang sama langsung dari data NLTK yang terpasang (cara lama, butuh import NLTK).
+def nltk_nlp_resources():
+    # Mencoba mengambil daftar kata sambung (stopwords) Bahasa Indonesia dari NLTK.
+    try:
+        stop_words = nltk.corpus.stopwords.words('indonesian')
+    # Jika gagal/belum terdownload, gunakan daftar kosong (tidak ada filter).
+    except Exception:
+        stop_words = []
+    # Jika word_tokenize NLTK tidak bisa dipakai (misal data 'punkt' belum ada),
+    # cadangannya adalah split spasi biasa (tanpa pemecahan kontraksi).
+    try:
+        nltk.tokenize.word_tokenize("cannot")
+        split_contractions = True
+    except Exception:
+        split_contractions = False
+    return {'stopwords': stop_words, 'split_contractions': split_contractions}
+
+# Menulis artefak resource bahasa (default: dari data NLTK yang terpasang). Dipakai oleh pack_resources.py.
+def pack_nlp_resources(path=NLP_RESOURCES_PATH, resources=None):
+    resources = resources if resources is not None else nltk_nlp_resources()
+    packed = {
+        'format': NLP_RESOURCES_FORMAT,
+        'source': f"nltk {nltk.__version__}",
+        'split_contractions': resources['split_contractions'],
+        'stopwords': {'indonesian': sorted(set(resources['stopwords']))},
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".nlp-", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(packed, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    os.replace(tmp_path, path)
+    return packed
+
+# Resource bahasa untuk tokenizer, dimuat sekali per proses: dari artefak lokal jika ada,
+# jika tidak dari data NLTK (dengan download bila diizinkan).
+@st.cache_resource
+def get_nlp_resources():
+    with track_stage('nlp_resources'):
+        resources = load_packed_nlp_resources()
+        if resources is None:
+            if NLTK_DOWNLOAD:
+                download_nltk_data()
+            resources = nltk_nlp_resources()
+    return resources
+
+# ==============================================================================
+# BAGIAN 4: INSTRUMENTASI (WAKTU & MEMORI PER TAHAP)
+# ==============================================================================
+
+# Lokasi log JSONL berisi satu baris per tahap yang dijalankan. Kosongkan PPW_STAGE_LOG untuk mematikan.
+STAGE_LOG_PATH = os.environ.get(
+    "PPW_STAGE_LOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ppw_logs", "stages.jsonl")
+)
+# Ukuran maksimal satu file log sebelum diganti, dan jumlah file lama yang disimpan.
+STAGE_LOG_MAX_BYTES = int(os.environ.get("PPW_STAGE_LOG_MAX_MB", "10")) * 1024 * 1024
+STAGE_LOG_BACKUPS = 5
+
+# Daftar "hook": fungsi yang dipanggil dengan record (dict) setiap kali satu tahap selesai.
+# Profiler lain cukup mendaftar di sini (add_stage_hook) tanpa mengubah app.py.
+class StageRegistry:
+    def __init__(self):
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add(self, callback):
+        with self._lock:
+            self._hooks.append(callback)
+        return callback
+
+    def remove(self, callback):
+        with self._lock:
+            if callback in self._hooks:
+                self._hooks.remove(callback)
+
+    def emit(self, record):
+        with self._lock:
+            hooks = list(self._hooks)
+        for hook in hooks:
+            try:
+                hook(record)
+            except Exception:
+                # Hook yang error tidak boleh menjatuhkan aplikasi.
+                pass
+
+# Hook bawaan: menulis setiap record sebagai satu baris JSON ke file log yang berotasi.
+def _jsonl_log_hook(path):
+    logger = logging.getLogger("ppw.stages")
+    # Handler hanya dipasang sekali per proses.
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=STAGE_LOG_MAX_BYTES, backupCount=STAGE_LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    def hook(record):
+        logger.info(json.dumps(record, ensure_ascii=False))
+    return hook
+
+# Registry dibuat sekali per proses (bertahan antar rerun Streamlit).
+# Hook tambahan bisa didaftarkan lewat environment variable, misal PPW_STAGE_HOOKS="profiler_kami:on_stage".
+@st.cache_resource
+def get_stage_registry():
+    registry = StageRegistry()
+    if STAGE_LOG_PATH:
+        try:
+            registry.add(_jsonl_log_hook(STAGE_LOG_PATH))
+        except OSError:
+            # Folder log tidak bisa ditulis: instrumentasi tetap jalan tanpa file log.
+            pass
+    for spec in os.environ.get("PPW_STAGE_HOOKS", "").split(","):
+        if spec.strip():
+            module_name, _, attr = spec.strip().partition(":")
+            registry.add(getattr(importlib.import_module(module_name), attr))
+    return registry
+
+# API publik untuk profiler: add_stage_hook(fungsi) / remove_stage_hook(fungsi).
+def add_stage_hook(callback):
+    return get_stage_registry().add(callback)
+
+def remove_stage_hook(callback):
+    get_stage_registry().remove(callback)
+
+# Data per rerun disimpan per thread (setiap sesi Streamlit berjalan di thread-nya sendiri).
+_run_state = threading.local()
+
+# Menandai awal satu rerun. Mengembalikan list yang akan terisi record semua tahap di rerun ini.
+def begin_run():
+    _run_state.run_id = uuid.uuid4().hex[:8]
+    _run_state.records = []
+    return _run_state.records
+
+# Pengukuran puncak memori Python (tracemalloc) untuk seluruh proses. tracemalloc bersifat global
+# (memperlambat alokasi di semua sesi, dan puncaknya hanya satu untuk semua thread), jadi:
+# - tracemalloc hanya aktif selama ada sesi yang menyalakan diagnostik (sesi yang tidak terlihat
+#   lagi selama SESSION_TTL detik dianggap sudah ditutup);
+# - puncak hanya dicatat untuk tahap TERLUAR di sebuah thread (tahap di dalamnya tidak me-reset
+#   puncak tahap luar), dan hanya jika tidak ada tahap lain (thread lain) yang mulai selama tahap
+#   itu berjalan. Jika tumpang tindih, peak_mb dikosongkan daripada menampilkan angka yang salah;
+# - tracemalloc yang dinyalakan pihak lain (profiler sendiri, benchmark.py) tidak pernah di-reset
+#   atau dimatikan: selama itu peak_mb dikosongkan dan pengukurannya diserahkan ke pemiliknya.
+class MemoryTracer:
+    SESSION_TTL = 600
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}             # Kunci sesi -> waktu terakhir diagnostik sesi itu terlihat aktif.
+        self._local = threading.local() # Kedalaman tahap bersarang per thread.
+        self._active = 0                # Tahap terluar yang sedang diukur (semua thread).
+        self._starts = 0                # Jumlah tahap terluar yang pernah mulai diukur.
+        self._owned = False             # True jika tracemalloc dinyalakan oleh tracer ini.
+
+    # Dipanggil setiap rerun: diagnostik sesi ini menyala/mati.
+    def set_enabled(self, session, enabled):
+        with self._lock:
+            now = time.monotonic()
+            if enabled:
+                self._sessions[session] = now
+            else:
+                self._sessions.pop(session, None)
+            for key, seen in list(self._sessions.items()):
+                if now - seen > self.SESSION_TTL:
+                    del self._sessions[key]
+            if self._sessions and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owned = True
+            self._stop_if_unused()
+
+    # Hanya tracemalloc milik sendiri yang dimatikan (dan hanya jika sudah tidak dipakai).
+    def _stop_if_unused(self):
+        if self._owned and not self._sessions and not self._active:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._owned = False
+
+    # Awal satu tahap. Mengembalikan token untuk end(): None = tahap ini tidak diukur.
+    def begin(self):
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        if depth:
+            return None
+        with self._lock:
+            if not self._owned or not tracemalloc.is_tracing():
+                return None
+            self._active += 1
+            self._starts += 1
+            if self._active > 1:
+                # Tahap lain sedang berjalan: puncaknya tercampur, tidak dicatat (tapi tetap dihitung aktif).
+                return 0
+            tracemalloc.reset_peak()
+            return self._starts
+
+    # Akhir satu tahap. Mengembalikan puncak memori (MB) atau None.
+    def end(self, token):
+        self._local.depth -= 1
+        if token is None:
+            return None
+        with self._lock:
+            peak_mb = None
+            if token and token == self._starts:
+                peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            self._active -= 1
+            self._stop_if_unused()
+        return peak_mb
+
+# Dibuat sekali per proses. show_spinner=False: bisa pertama kali dipanggil dari thread antrian upload.
+@st.cache_resource(show_spinner=False)
+def get_memory_tracer():
+    return MemoryTracer()
+
+# Mengukur satu tahap: waktu nyata (wall), waktu CPU thread ini, dan puncak memori.
+# Puncak memori Python (peak_mb) hanya tersedia jika ada sesi yang menyalakan diagnostik (lihat MemoryTracer);
+# rss_max_mb adalah puncak memori seluruh proses sejak start.
+# Catatan: CPU di proses lain (ekstraksi PDF paralel) tidak ikut terhitung di cpu_ms.
+@contextlib.contextmanager
+def track_stage(stage, document=None):
+    tracer = get_memory_tracer()
+    token = tracer.begin()
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
     try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        # Download stopwords jika belum ada.
-        nltk.download('stopwords', quiet=True)
+        yield
+    finally:
+        wall_ms = (time.perf_counter() - wall_start) * 1000
+        cpu_ms = (time.thread_time() - cpu_start) * 1000
+        _emit_stage(stage, document, wall_ms=wall_ms, cpu_ms=cpu_ms, peak_mb=tracer.end(token))
+
+# Mencatat tahap yang waktunya sudah diukur di tempat lain (misal waktu import saat skrip dimuat).
+def record_stage(stage, wall_seconds, document=None):
+    _emit_stage(stage, document, wall_ms=wall_seconds * 1000, cpu_ms=None, peak_mb=None)
+
+def _emit_stage(stage, document, wall_ms, cpu_ms, peak_mb):
+    record = {
+        'time': time.time(),
+        'run': getattr(_run_state, 'run_id', None),
+        'stage': stage,
+        'document': document,
+        'wall_ms': wall_ms,
+        'cpu_ms': cpu_ms,
+        'peak_mb': peak_mb,
+        'rss_max_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+    }
+    records = getattr(_run_state, 'records', None)
+    if records is not None:
+        records.append(record)
+    get_stage_registry().emit(record)
+
+# Panel diagnostik di sidebar: tabel semua tahap yang dijalankan pada rerun ini.
+# names = {sidik jari dokumen: nama file} agar kolom dokumen mudah dibaca.
+def render_diagnostics(records, names):
+    with st.sidebar.expander("🩺 Diagnostik", expanded=True):
+        if not records:
+            st.caption("Tidak ada tahap yang dijalankan pada rerun ini (semua diambil dari cache).")
+            return
+        df = pd.DataFrame(records)
+        df['document'] = df['document'].map(lambda digest: names.get(digest, digest))
+        st.caption(f"Rerun {records[0]['run']} | total {df['wall_ms'].sum():.0f} ms")
+        st.dataframe(
+            df[['document', 'stage', 'wall_ms', 'cpu_ms', 'peak_mb', 'rss_max_mb']].round(1),
+            hide_index=True,
+        )
 
 # ==============================================================================
-# BAGIAN 4: FUNGSI EKSTRAKSI (MEMBACA) PDF
+# BAGIAN 5: FUNGSI EKSTRAKSI (MEMBACA) PDF
 # ==============================================================================
 
+# Jumlah halaman minimal sebelum ekstraksi dipecah ke beberapa proses.
+# PDF kecil lebih cepat dibaca langsung, karena membuat/mengirim data ke proses lain juga ada biayanya.
+PARALLEL_MIN_PAGES = 64
+# Jumlah proses pekerja (worker) untuk ekstraksi paralel, default = jumlah core CPU.
+PDF_WORKERS = os.cpu_count() or 1
+
+# Pool proses dibuat sekali saja lalu dipakai ulang oleh semua upload dan semua rerun (membuat proses baru itu mahal).
+# @st.cache_resource dipakai karena Streamlit menjalankan ulang file ini setiap rerun (variabel global ikut ter-reset).
+# show_spinner=False: pool bisa pertama kali dibutuhkan dari thread antrian upload (tanpa layar untuk spinner).
+@st.cache_resource(show_spinner=False)
+def get_pdf_pool(max_workers):
+    return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+
+# Menghentikan pool yang rusak tanpa menunggu, lalu membuangnya dari cache.
+def _discard_pdf_pool(pool):
+    pool.shutdown(wait=False, cancel_futures=True)
+    get_pdf_pool.clear()
+
+# Dilempar jika pemrosesan sebuah file dibatalkan (misal file dihapus dari uploader saat masih diproses).
+class IngestCancelled(Exception):
+    pass
+
+# Berhenti di titik aman jika `cancel` (threading.Event) sudah diset.
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise IngestCancelled()
+
+# Fungsi pekerja: dijalankan di proses lain, membaca halaman [start, stop) dari PDF yang ada di memori.
+# Mengembalikan list teks per halaman (urut), supaya jalur streaming tetap bisa memproses per halaman.
+def _extract_page_range(pdf_bytes, start, stop):
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+# Jumlah halaman PDF (tanpa membaca teksnya).
+def pdf_page_count(pdf_bytes):
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc.page_count
+
+# Generator: teks PDF halaman demi halaman, di proses ini (hanya satu halaman yang dipegang setiap saat).
+# progress(selesai, total) dipanggil setiap halaman selesai dibaca (opsional).
+# cancel (threading.Event, opsional) diperiksa sebelum setiap halaman; jika diset, IngestCancelled dilempar.
+# start = nomor halaman pertama yang dibaca (0 = dari awal).
+def iter_page_texts(pdf_bytes, progress=None, cancel=None, start=0):
+    # Buka PDF langsung dari RAM (stream), tanpa menulis file sementara ke hardisk.
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page_count = doc.page_count
+        for number in range(start, page_count):
+            _check_cancel(cancel)
+            yield doc[number].get_text()
+            if progress is not None:
+                progress(number + 1, page_count)
+
+# Generator: teks PDF halaman demi halaman, selalu sesuai urutan halaman. Dipakai jalur biasa
+# (extract_text_from_bytes) maupun jalur streaming (stream_document_index).
+# PDF pendek (atau mesin 1 core) dibaca berurutan di proses ini. PDF panjang dibagi menjadi beberapa
+# rentang halaman (satu per worker) yang dibaca paralel; satu rentang dikeluarkan begitu rentang itu dan
+# semua rentang sebelumnya selesai, jadi yang ditampung hanya teks rentang yang sudah selesai lebih dulu.
+# progress & cancel: lihat iter_page_texts (di jalur paralel, kemajuan dilaporkan per rentang halaman).
+def iter_pdf_pages(pdf_bytes, progress=None, cancel=None):
+    page_count = pdf_page_count(pdf_bytes)
+    if page_count < PARALLEL_MIN_PAGES or PDF_WORKERS < 2:
+        yield from iter_page_texts(pdf_bytes, progress, cancel)
+        return
+
+    step = -(-page_count // PDF_WORKERS)  # Pembagian dibulatkan ke atas.
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    # Proses lain butuh salinan bytes biasa (memoryview tidak bisa dikirim antar-proses).
+    payload = bytes(pdf_bytes)
+    # Pool hanya dibuat saat pertama kali dibutuhkan (PDF kecil tidak pernah memicu pembuatan pool).
+    pool = get_pdf_pool(PDF_WORKERS)
+    futures = []
+    # Halaman pertama yang belum dikeluarkan (titik lanjut jika pool rusak di tengah jalan).
+    next_page = 0
+    try:
+        futures = [pool.submit(_extract_page_range, payload, start, stop) for start, stop in ranges]
+        reported = 0
+        for future, (start, stop) in zip(futures, ranges):
+            # Tunggu rentang berikutnya sedikit demi sedikit agar pembatalan diperiksa dan kemajuan
+            # rentang lain (yang mungkin selesai lebih dulu) tetap dilaporkan.
+            while True:
+                _check_cancel(cancel)
+                done = sum(b - a for f, (a, b) in zip(futures, ranges) if f.done() and not f.cancelled())
+                if progress is not None and done != reported:
+                    progress(done, page_count)
+                    reported = done
+                try:
+                    texts = future.result(timeout=0.5)
+                    break
+                except concurrent.futures.TimeoutError:
+                    continue
+            yield from texts
+            next_page = stop
+    except concurrent.futures.process.BrokenProcessPool:
+        # Worker mati mendadak (misal kehabisan memori): pool ini tidak bisa dipakai lagi. Hentikan prosesnya,
+        # buang dari cache (upload berikutnya membuat pool baru), lalu lanjutkan berurutan dari halaman
+        # yang belum dikeluarkan. Error lain (misal PDF rusak) bukan masalah pool, jadi diteruskan ke pemanggil.
+        _discard_pdf_pool(pool)
+        yield from iter_page_texts(pdf_bytes, progress, cancel, start=next_page)
+    finally:
+        # Dibatalkan, error, atau pemanggil berhenti membaca: rentang yang belum mulai dibatalkan,
+        # yang sedang berjalan dibiarkan selesai lalu dibuang.
+        for future in futures:
+            future.cancel()
+    if progress is not None:
+        progress(page_count, page_count)
+
+# Fungsi ini menerima isi PDF (bytes / memoryview) dan mengembalikan seluruh teksnya.
+# progress & cancel: lihat iter_pdf_pages.
+def extract_text_from_bytes(pdf_bytes, progress=None, cancel=None):
+    return "".join(iter_pdf_pages(pdf_bytes, progress, cancel))
+
 # Fungsi ini menerima file PDF yang diupload user, lalu mengembalikan isinya dalam bentuk teks panjang.
 def extract_text_from_pdf(uploaded_file):
-    # Membuka blok 'tempfile' untuk membuat file sementara yang aman.
-    # delete=False artinya file tidak langsung dihapus saat blok kode selesai (kita hapus manual nanti).
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        # Menulis/menyalin isi file yang ada di RAM (uploaded_file) ke dalam file sementara di hardisk.
-        tmp_file.write(uploaded_file.getvalue()) 
-        # Menyimpan alamat/lokasi file sementara tersebut (path) ke variabel tmp_path.
-        tmp_path = tmp_file.name 
-    
-    # Membuka file PDF yang ada di alamat sementara tadi menggunakan library PyMuPDF (fitz).
-    doc = fitz.open(tmp_path) 
-    
-    # Menyiapkan variabel string kosong untuk menampung hasil teks.
-    text = ""                 
-    
-    # Melakukan loop untuk membaca setiap halaman yang ada di dalam PDF.
-    for page in doc:          
-        # Mengambil teks dari halaman tersebut dan menambahkannya ke variabel 'text'.
-        text += page.get_text() 
-    
-    # Menutup file PDF agar tidak memakan memori.
-    doc.close()               
-    
-    # Menghapus file sementara yang tadi kita buat dari sistem komputer.
-    # Ini PENTING agar hardisk server tidak penuh dengan sampah file temp.
-    os.remove(tmp_path)       
-    
-    # Mengembalikan hasil teks bersih ke pemanggil fungsi.
-    return text               
+    # getbuffer() memberi akses langsung ke isi file di RAM tanpa menyalinnya (beda dengan getvalue()).
+    return extract_text_from_bytes(uploaded_file.getbuffer())
 
 # ==============================================================================
-# BAGIAN 5: FUNGSI PRE-PROCESSING (BERSIH-BERSIH TEKS)
+# BAGIAN 6: FUNGSI PRE-PROCESSING (BERSIH-BERSIH TEKS)
 # ==============================================================================
 
+# Daftar kata sampah tambahan (Custom Stopwords) yang spesifik untuk paper/jurnal.
+CUSTOM_STOPWORDS = (
+    'dan', 'yang', 'di', 'ke', 'dari', 'ini', 'itu', 'pada', 'untuk', 'dengan', 'adalah', 
+    'sebagai', 'juga', 'karena', 'oleh', 'dalam', 'akan', 'dapat', 'tersebut', 'saya', 'kita',
+    'kami', 'anda', 'ia', 'dia', 'mereka', 'apa', 'siapa', 'bagaimana', 'mengapa', 'kapan',
+    'dimana', 'kenapa', 'bisa', 'ada', 'tidak', 'ya', 'hal', 'maka', 'atau', 'jika', 'saat',
+    'serta', 'setelah', 'sebelum', 'lalu', 'sedangkan', 'meskipun', 'sehingga', 'namun',
+    'bagi', 'antara', 'selama', 'setiap', 'suatu', 'sudah', 'telah', 'agar', 'pun',
+    'gambar', 'tabel', 'penelitian', 'metode', 'data', 'hasil', 'analisis', 'pembahasan',
+    'kesimpulan', 'saran', 'daftar', 'pustaka', 'universitas', 'jurusan', 'fakultas',
+    'skripsi', 'tesis', 'disertasi', 'jurnal', 'paper', 'makalah', 'bab', 'halaman',
+    'berdasarkan', 'menggunakan', 'dilakukan', 'merupakan', 'terhadap', 'adanya', 
+    'menunjukkan', 'terdiri', 'mengenai', 'dijelaskan', 'penerapan', 'penggunaan', 
+    'perancangan', 'pengujian', 'implementasi', 'sistem', 'aplikasi', 'program', 'proses',
+    'studi', 'kasus', 'abstract', 'abstrak', 'keyword', 'kata', 'kunci', 'latar', 'belakang'
+)
+
+# Tokenizer yang dibuat SEKALI per proses: daftar stopwords dan pola regex sudah disiapkan di awal,
+# lalu teks diproses potong demi potong (streaming) tanpa membuat salinan teks utuh.
+# Hasilnya sama persis (token demi token) dengan cara lama:
+# hapus angka -> hapus tanda baca -> lowercase -> word_tokenize -> filter.
+class TextTokenizer:
+    # Pola pembersih yang sudah di-compile: angka (0-9) dan tanda baca ([^\w\s]).
+    DIGIT_PATTERN = re.compile(r'\d+')
+    PUNCT_PATTERN = re.compile(r'[^\w\s]')
+    # Dipakai untuk mencari spasi terdekat, supaya potongan teks tidak pernah memotong di tengah kata.
+    WHITESPACE = re.compile(r'\s')
+    # Ukuran potongan teks (karakter) yang dibersihkan sekaligus.
+    CHUNK_SIZE = 1 << 16
+    # Setelah tanda baca dibuang, satu-satunya hal yang dilakukan word_tokenize selain memisah spasi
+    # adalah memecah kontraksi bahasa Inggris berikut (daftar MacIntyreContractions milik NLTK).
+    CONTRACTIONS = {
+        'cannot': ('can', 'not'),
+        'gimme': ('gim', 'me'),
+        'gonna': ('gon', 'na'),
+        'gotta': ('got', 'ta'),
+        'lemme': ('lem', 'me'),
+        'wanna': ('wan', 'na'),
+    }
+    # Huruf 'İ' (I bertitik, misal "İSTANBUL") menjadi 'i' + U+0307 setelah lower(). U+0307 bukan huruf,
+    # jadi word_tokenize melihat batas kata di situ dan ikut memecah kontraksi di akhir kata,
+    # contoh "i̇cannot" -> "i̇", "can", "not". Pola ini meniru perilaku tersebut.
+    MARKED_CONTRACTION = re.compile('\u0307(%s)$' % '|'.join(CONTRACTIONS))
+    # Versi aturan pembersihan. Naikkan jika cara tokenize berubah agar cache token lama tidak terpakai.
+    VERSION = 2
+
+    def __init__(self, resources=None):
+        # Stopwords Bahasa Indonesia & mode tokenizer (dari artefak lokal, lihat BAGIAN 3).
+        resources = resources if resources is not None else get_nlp_resources()
+        # Menggabungkan stopwords bawaan dengan stopwords buatan sendiri, lalu dibekukan (frozenset).
+        self.stop_words = frozenset(resources['stopwords']).union(CUSTOM_STOPWORDS)
+        # False = word_tokenize NLTK tidak tersedia saat artefak dibuat: cukup split spasi biasa.
+        self.split_contractions = resources['split_contractions']
+        # Sidik jari konfigurasi (versi aturan + stopwords + mode kontraksi), ikut menjadi kunci cache
+        # (BAGIAN 7): stopwords atau artefak NLP yang berbeda tidak akan memakai token dari cache lama.
+        config = json.dumps([self.VERSION, sorted(self.stop_words), self.split_contractions])
+        self.fingerprint = hashlib.sha256(config.encode("utf-8")).hexdigest()[:16]
+
+    # Memecah kontraksi yang menempel setelah U+0307, misal "xi̇gonna" -> ("xi̇", "gon", "na").
+    def split_marked(self, word):
+        match = self.MARKED_CONTRACTION.search(word)
+        if match is None:
+            return (word,)
+        return (word[:match.start(1)],) + self.CONTRACTIONS[match.group(1)]
+
+    # Memotong teks menjadi potongan sekitar CHUNK_SIZE karakter, selalu berakhir di karakter spasi.
+    def iter_chunks(self, text):
+        start = 0
+        length = len(text)
+        while start < length:
+            end = start + self.CHUNK_SIZE
+            if end < length:
+                # Geser ujung potongan ke spasi berikutnya agar tidak ada kata yang terbelah.
+                match = self.WHITESPACE.search(text, end)
+                end = match.end() if match else length
+            yield text[start:end]
+            start = end
+
+    # Generator: menghasilkan kata-kata bersih satu per satu.
+    def tokenize(self, text):
+        stop_words = self.stop_words
+        contractions = self.CONTRACTIONS if self.split_contractions else {}
+        for chunk in self.iter_chunks(text):
+            # Hapus angka & tanda baca, ubah ke huruf kecil, lalu pisah per spasi.
+            # Semuanya dikerjakan pada potongan kecil ini saja, bukan pada salinan teks utuh.
+            chunk = self.PUNCT_PATTERN.sub('', self.DIGIT_PATTERN.sub('', chunk))
+            chunk = chunk.lower()
+            words = chunk.split()
+            # Pecah kontraksi hanya jika potongan ini memang mengandungnya (jarang sekali).
+            if contractions and not contractions.keys().isdisjoint(words):
+                words = [part for word in words for part in contractions.get(word, (word,))]
+            # Sama, untuk kata yang mengandung 'İ' (lihat MARKED_CONTRACTION).
+            if contractions and '\u0307' in chunk:
+                words = [part for word in words for part in self.split_marked(word)]
+            # Hanya ambil kata JIKA: panjang > 2, isinya huruf, dan bukan stopword.
+            yield from [word for word in words if len(word) > 2 and word.isalpha() and word not in stop_words]
+
+    # Generator untuk teks yang datang bertahap (misal halaman demi halaman dari PDF): menghasilkan
+    # list kata per potongan sekitar CHUNK_SIZE karakter. Hasil gabungannya sama persis dengan
+    # tokenize("".join(texts)): kata yang terbelah di batas halaman disambung dulu ke halaman berikutnya.
+    def tokenize_pages(self, texts):
+        pending = []
+        size = 0
+        for text in texts:
+            pending.append(text)
+            size += len(text)
+            if size < self.CHUNK_SIZE:
+                continue
+            buffer = "".join(pending)
+            # Potong setelah spasi terakhir; sisa kata yang belum lengkap ikut potongan berikutnya.
+            carry = buffer.rsplit(None, 1)[-1] if buffer and not buffer[-1].isspace() else ""
+            words = list(self.tokenize(buffer[:len(buffer) - len(carry)]))
+            if words:
+                yield words
+            pending = [carry]
+            size = len(carry)
+        words = list(self.tokenize("".join(pending)))
+        if words:
+            yield words
+
+# @st.cache_resource: tokenizer (beserta stopwords & regex) cukup dibuat sekali untuk semua sesi.
+# show_spinner=False: bisa dipanggil pertama kali dari thread job upload (lihat _cache_path).
+@st.cache_resource(show_spinner=False)
+def get_tokenizer():
+    with track_stage('tokenizer_init'):
+        return TextTokenizer()
+
 # Fungsi ini menerima teks kotor, membersihkannya, dan mengembalikan daftar kata (list).
 def process_text(text):
-    # Menggunakan Regex untuk menghapus semua angka (0-9) dan menggantinya dengan kosong.
-    text = re.sub(r'\d+', '', text)        
-    # Menggunakan Regex untuk menghapus semua tanda baca (titik, koma, seru, dll).
-    # [^\w\s] artinya: hapus apa pun yang BUKAN huruf dan BUKAN spasi.
-    text = re.sub(r'[^\w\s]', '', text)    
-    # Mengubah semua huruf menjadi huruf kecil (lowercase) agar seragam.
-    text = text.lower()                    
-    
-    # Mencoba memotong kalimat menjadi kata-kata menggunakan alat pintar NLTK (word_tokenize).
+    return list(get_tokenizer().tokenize(text))
+
+# ==============================================================================
+# BAGIAN 7: CACHE PERSISTEN (TEKS & TOKEN) DI DISK
+# ==============================================================================
+
+# Folder cache dipakai bersama oleh semua sesi browser dan semua proses server di mesin yang sama.
+# Bisa diganti lewat environment variable PPW_CACHE_DIR; string kosong = cache dimatikan.
+CACHE_DIR = os.environ.get("PPW_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ppw_cache"))
+# Batas ukuran total cache (MB). Jika terlewati, file yang paling lama tidak dipakai akan dihapus (LRU).
+CACHE_MAX_BYTES = int(os.environ.get("PPW_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# Penanda format file cache. Naikkan versinya jika susunan file berubah; perubahan aturan process_text
+# sudah tercakup oleh sidik jari tokenizer di nama file (lihat _cache_path).
+_CACHE_MAGIC = b"PPW1"
+# Header: magic (4 byte) + panjang teks dalam bytes UTF-8 (8 byte).
+_CACHE_HEADER = struct.Struct("<4sQ")
+
+# Kunci cache = hash SHA-256 dari isi PDF, jadi dua file bernama sama tapi isinya beda tidak akan bentrok.
+def pdf_digest(pdf_bytes):
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+# Nama file = hash PDF + sidik jari tokenizer, jadi token hasil konfigurasi lain tidak akan terbaca.
+# File dengan sidik jari lama tidak dipakai lagi dan akhirnya terhapus oleh batas LRU.
+def _cache_path(digest):
+    return os.path.join(CACHE_DIR, "%s.%s.bin" % (digest, get_tokenizer().fingerprint))
+
+# Membaca teks + token dari cache. Mengembalikan (raw_text, words) atau None jika belum ada.
+def load_cached_document(digest):
+    if not CACHE_DIR:
+        return None
+    path = _cache_path(digest)
     try:
-        words = word_tokenize(text)        
-    # Jika NLTK error (jarang terjadi), gunakan metode split spasi biasa sebagai cadangan.
-    except:
-        words = text.split()               
-    
-    # Mencoba mengambil daftar kata sambung (stopwords) Bahasa Indonesia dari NLTK.
+        with open(path, "rb") as f:
+            magic, text_len = _CACHE_HEADER.unpack(f.read(_CACHE_HEADER.size))
+            if magic != _CACHE_MAGIC:
+                return None
+            body = zlib.decompress(f.read())
+        # Tandai file ini baru saja dipakai (waktu modifikasi dipakai sebagai urutan LRU).
+        os.utime(path)
+    except (OSError, struct.error, zlib.error):
+        # File belum ada, rusak, atau sedang dihapus proses lain: anggap cache miss.
+        return None
+
+    raw_text = body[:text_len].decode("utf-8")
+    token_blob = body[text_len:].decode("utf-8")
+    # Token tidak pernah berisi spasi/baris baru, jadi cukup dipisah dengan "\n".
+    words = token_blob.split("\n") if token_blob else []
+    return raw_text, words
+
+# Menyimpan teks + token ke cache dalam format biner yang dikompres.
+def store_cached_document(digest, raw_text, words):
+    if not CACHE_DIR:
+        return
+    text_bytes = raw_text.encode("utf-8")
+    body = zlib.compress(text_bytes + "\n".join(words).encode("utf-8"))
     try:
-        stop_words = set(stopwords.words('indonesian')) 
-    # Jika gagal/belum terdownload, gunakan himpunan kosong (tidak ada filter).
-    except:
-        stop_words = set()                 
-        
-    # Membuat daftar kata sampah tambahan (Custom Stopwords) yang spesifik untuk paper/jurnal.
-    custom_stopwords = [
-        'dan', 'yang', 'di', 'ke', 'dari', 'ini', 'itu', 'pada', 'untuk', 'dengan', 'adalah', 
-        'sebagai', 'juga', 'karena', 'oleh', 'dalam', 'akan', 'dapat', 'tersebut', 'saya', 'kita',
-        'kami', 'anda', 'ia', 'dia', 'mereka', 'apa', 'siapa', 'bagaimana', 'mengapa', 'kapan',
-        'dimana', 'kenapa', 'bisa', 'ada', 'tidak', 'ya', 'hal', 'maka', 'atau', 'jika', 'saat',
-        'serta', 'setelah', 'sebelum', 'lalu', 'sedangkan', 'meskipun', 'sehingga', 'namun',
-        'bagi', 'antara', 'selama', 'setiap', 'suatu', 'sudah', 'telah', 'agar', 'pun',
-        'gambar', 'tabel', 'penelitian', 'metode', 'data', 'hasil', 'analisis', 'pembahasan',
-        'kesimpulan', 'saran', 'daftar', 'pustaka', 'universitas', 'jurusan', 'fakultas',
-        'skripsi', 'tesis', 'disertasi', 'jurnal', 'paper', 'makalah', 'bab', 'halaman',
-        'berdasarkan', 'menggunakan', 'dilakukan', 'merupakan', 'terhadap', 'adanya', 
-        'menunjukkan', 'terdiri', 'mengenai', 'dijelaskan', 'penerapan', 'penggunaan', 
-        'perancangan', 'pengujian', 'implementasi', 'sistem', 'aplikasi', 'program', 'proses',
-        'studi', 'kasus', 'abstract', 'abstrak', 'keyword', 'kata', 'kunci', 'latar', 'belakang'
-    ]
-    # Menggabungkan daftar stopwords bawaan dengan stopwords buatan sendiri.
-    stop_words.update(custom_stopwords) 
-    
-    # Melakukan filter terakhir (List Comprehension).
-    # Hanya ambil kata JIKA: 
-    # 1. Isinya huruf (isalpha), 
-    # 2. Tidak ada di daftar stopwords, 
-    # 3. Panjang kata lebih dari 2 huruf.
-    filtered_words = [word for word in words if word.isalpha() and word not in stop_words and len(word) > 2]
-    
-    # Mengembalikan hasil daftar kata bersih.
-    return filtered_words
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Tulis ke file sementara dulu, lalu rename: proses lain tidak akan pernah membaca file setengah jadi.
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_CACHE_HEADER.pack(_CACHE_MAGIC, len(text_bytes)))
+            f.write(body)
+        os.replace(tmp_path, _cache_path(digest))
+        _evict_cache()
+    except OSError:
+        # Disk penuh / folder read-only: aplikasi tetap jalan, hanya tanpa cache.
+        pass
+
+# Menghapus file cache yang paling lama tidak dipakai sampai total ukuran di bawah CACHE_MAX_BYTES.
+def _evict_cache():
+    entries = []
+    total = 0
+    for entry in os.scandir(CACHE_DIR):
+        if not entry.name.endswith(".bin"):
+            continue
+        try:
+            info = entry.stat()
+        except OSError:
+            continue
+        entries.append((info.st_mtime, info.st_size, entry.path))
+        total += info.st_size
+
+    # Urutkan dari yang paling lama dipakai, lalu hapus satu per satu.
+    entries.sort()
+    for _, size, path in entries:
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            # Mungkin sudah dihapus oleh proses lain.
+            pass
+        total -= size
+
+# Ukuran blok yang dibaca sekaligus saat token dibaca bertahap dari cache (byte terkompres dari file,
+# dan juga batas byte hasil dekompresi per langkah: teks yang mudah dikompres tidak meledak di memori).
+CACHE_READ_BYTES = 1 << 18
+
+# Membaca token dari cache SEDIKIT DEMI SEDIKIT (tanpa memuat seluruh teks/token ke memori).
+# Mengembalikan generator list kata (per blok), atau None jika cache belum ada / formatnya lain.
+# Generator melempar zlib.error jika file cache ternyata rusak/terpotong.
+def iter_cached_tokens(digest):
+    if not CACHE_DIR:
+        return None
+    path = _cache_path(digest)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    try:
+        magic, text_len = _CACHE_HEADER.unpack(f.read(_CACHE_HEADER.size))
+        if magic != _CACHE_MAGIC:
+            f.close()
+            return None
+        # Tandai file ini baru saja dipakai (urutan LRU).
+        os.utime(path)
+    except (OSError, struct.error):
+        f.close()
+        return None
+    return _read_cached_tokens(f, text_len)
+
+# Generator: isi terkompres file f, didekompres per blok berukuran maksimal CACHE_READ_BYTES.
+def _decompressed_blocks(f):
+    decompressor = zlib.decompressobj()
+    while not decompressor.eof:
+        pending = decompressor.unconsumed_tail or f.read(CACHE_READ_BYTES)
+        if not pending:
+            raise zlib.error("file cache terpotong")
+        yield decompressor.decompress(pending, CACHE_READ_BYTES)
+
+def _read_cached_tokens(f, text_len):
+    with f:
+        # Bagian awal isi terkompres adalah teks mentah (text_len byte): dilewati, tidak disimpan.
+        skip = text_len
+        carry = b""
+        for data in _decompressed_blocks(f):
+            if skip:
+                cut = min(skip, len(data))
+                data = data[cut:]
+                skip -= cut
+            buffer = carry + data
+            # Hanya token yang sudah lengkap (diakhiri "\n") yang dikeluarkan; sisanya menunggu blok berikutnya.
+            cut = buffer.rfind(b"\n") + 1
+            if cut > 1:
+                yield buffer[:cut - 1].decode("utf-8").split("\n")
+            carry = buffer[cut:]
+        if carry:
+            yield [carry.decode("utf-8")]
+
+# Menulis cache (format yang sama dengan store_cached_document) secara bertahap, halaman demi halaman.
+# Teks langsung dikompres ke file sementara; token ditampung di file sementara lain, karena di format
+# cache token baru boleh ditulis setelah seluruh teks. Dipakai sebagai context manager: file cache
+# hanya dipasang jika blok with selesai tanpa error (misal tidak dibatalkan).
+class CacheWriter:
+    def __init__(self, digest):
+        self.digest = digest
+        self.text_len = 0
+        self._has_tokens = False
+        self._compressor = zlib.compressobj()
+        self._file = self._tokens = self._tmp_path = None
+        if not CACHE_DIR:
+            # Cache dimatikan: semua penulisan diabaikan.
+            return
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, self._tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+            self._file = os.fdopen(fd, "wb")
+            # Panjang teks belum diketahui: header ditulis ulang di commit().
+            self._file.write(_CACHE_HEADER.pack(_CACHE_MAGIC, 0))
+            self._tokens = tempfile.TemporaryFile(dir=CACHE_DIR)
+        except OSError:
+            # Disk penuh / folder read-only: dokumen tetap diproses, hanya tanpa cache.
+            self.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    def write_text(self, text):
+        if self._file is None:
+            return
+        data = text.encode("utf-8")
+        self.text_len += len(data)
+        try:
+            self._file.write(self._compressor.compress(data))
+        except OSError:
+            self.abort()
+
+    def write_tokens(self, words):
+        if self._file is None or not words:
+            return
+        data = "\n".join(words).encode("utf-8")
+        try:
+            self._tokens.write(b"\n" + data if self._has_tokens else data)
+        except OSError:
+            self.abort()
+        self._has_tokens = True
+
+    def commit(self):
+        if self._file is None:
+            return
+        try:
+            # Token disalin dari file penampung ke belakang teks, di aliran zlib yang sama.
+            self._tokens.seek(0)
+            for block in iter(lambda: self._tokens.read(CACHE_READ_BYTES), b""):
+                self._file.write(self._compressor.compress(block))
+            self._file.write(self._compressor.flush())
+            self._file.seek(0)
+            self._file.write(_CACHE_HEADER.pack(_CACHE_MAGIC, self.text_len))
+            self._file.close()
+            self._tokens.close()
+            os.replace(self._tmp_path, _cache_path(self.digest))
+            self._file = None
+            _evict_cache()
+        except OSError:
+            self.abort()
+
+    # Membuang file sementara (cache tidak ditulis).
+    def abort(self):
+        for handle in (self._file, self._tokens):
+            if handle is not None:
+                handle.close()
+        if self._tmp_path is not None and os.path.exists(self._tmp_path):
+            try:
+                os.remove(self._tmp_path)
+            except OSError:
+                pass
+        self._file = self._tokens = None
+
+# Mengambil (raw_text, words) sebuah PDF: dari cache disk jika ada, selain itu ekstrak + bersihkan lalu simpan ke cache.
+# progress & cancel diteruskan ke extract_text_from_bytes (dipakai antrian upload di latar belakang).
+def load_document_tokens(pdf_bytes, digest=None, progress=None, cancel=None):
+    digest = digest or pdf_digest(pdf_bytes)
+    with track_stage('cache_load', digest):
+        cached = load_cached_document(digest)
+    if cached is not None:
+        return cached
+    # Jika ini benar-benar file baru, ekstrak teks dari PDF lalu jalankan fungsi pembersihan teks.
+    with track_stage('extract', digest):
+        raw_text = extract_text_from_bytes(pdf_bytes, progress, cancel)
+    _check_cancel(cancel)
+    with track_stage('tokenize', digest):
+        words = process_text(raw_text)
+    # Simpan ke cache disk agar upload berikutnya (di sesi/proses mana pun) langsung selesai.
+    with track_stage('cache_store', digest):
+        store_cached_document(digest, raw_text, words)
+    return raw_text, words
 
 # ==============================================================================
-# BAGIAN 6: FUNGSI MEMBUAT GRAPH (NETWORK)
+# BAGIAN 8: FUNGSI MEMBUAT GRAPH (NETWORK)
 # ==============================================================================
 
+# Mengubah daftar kata menjadi angka (integer): setiap kata unik mendapat ID sesuai urutan kemunculan pertamanya.
+# Mengembalikan (vocab, codes): vocab[ID] = kata, codes[i] = ID dari words[i].
+def encode_tokens(words):
+    codes, vocab = pd.factorize(np.asarray(words, dtype=object))
+    return np.asarray(vocab, dtype=object), codes.astype(np.int32)
+
+# Menghitung pasangan (kata target ke-i, kata ke-(i+distance)) untuk semua target start <= i < stop sekaligus
+# dengan menggeser array (tanpa loop Python). Hasilnya matriks segitiga atas (ID kecil, ID besar) -> jumlah.
+def _distance_pairs(codes, distance, start, stop, vocab_size):
+    stop = min(stop, len(codes) - distance)
+    if stop <= start:
+        return sp.csr_matrix((vocab_size, vocab_size), dtype=np.int32)
+    targets = codes[start:stop]
+    neighbors = codes[start + distance:stop + distance]
+    # Pasangan kata dengan dirinya sendiri (misal: "data data") dilewati, sama seperti versi lama.
+    keep = targets != neighbors
+    rows = np.minimum(targets, neighbors)[keep]
+    cols = np.maximum(targets, neighbors)[keep]
+    # csr_matrix menjumlahkan otomatis pasangan (baris, kolom) yang muncul berkali-kali.
+    return sp.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(vocab_size, vocab_size))
+
+# Membuat matriks ketetanggaan (adjacency) simetris dari matriks segitiga atas.
+def _symmetric(upper):
+    upper.eliminate_zeros()
+    return (upper + upper.T).tocsr()
+
+# Versi cepat pembuat co-occurrence: kata diubah ke ID integer lalu dihitung dengan NumPy.
+# Mengembalikan (vocab, A), A = matriks scipy.sparse simetris dengan A[u, v] = bobot yang sama persis
+# dengan build_graph (hanya target i < len(words) - window_size, pasangan kata yang sama dilewati).
+def build_cooccurrence_matrix(words, window_size=2):
+    vocab, codes = encode_tokens(words)
+    upper = sp.csr_matrix((len(vocab), len(vocab)), dtype=np.int32)
+    for distance in range(1, window_size + 1):
+        upper = upper + _distance_pairs(codes, distance, 0, len(codes) - window_size, len(vocab))
+    return vocab, _symmetric(upper)
+
+# Mengubah matriks co-occurrence menjadi objek Graph NetworkX (hanya dipanggil jika memang butuh Graph).
+def cooccurrence_to_networkx(vocab, A):
+    upper = sp.triu(A, k=1).tocoo()
+    G = nx.Graph()
+    # u = kata pertama, v = kata kedua, weight = jumlah kemunculan bersama.
+    # tolist(): label node menjadi objek Python biasa (ID integer edge list tidak boleh tetap np.int64).
+    G.add_weighted_edges_from(zip(vocab[upper.row].tolist(), vocab[upper.col].tolist(), upper.data.tolist()))
+    return G
+
 # Fungsi ini menerima daftar kata dan ukuran jendela (window_size) untuk menentukan hubungan antar kata.
+# Hasilnya tetap objek Graph NetworkX seperti sebelumnya, tetapi hitungannya memakai versi matriks di atas.
 def build_graph(words, window_size=2):
-    # Membuat dictionary kosong untuk mencatat pasangan kata yang muncul bersamaan.
-    co_occurrences = {} 
-    
-    # Melakukan loop dari kata pertama sampai kata (akhir dikurangi window_size).
-    for i in range(len(words) - window_size):
-        # Menentukan kata pusat (target).
-        target = words[i] 
-        # Mengambil potongan kata-kata di sebelah kanannya sebagai konteks/tetangga.
-        context = words[i+1 : i+1+window_size] 
-        
-        # Loop setiap kata tetangga di dalam konteks.
-        for neighbor in context:
-            # Jika kata target sama dengan tetangga (misal: "data data"), lewati/skip.
-            if target == neighbor: continue 
-            
-            # Membuat pasangan kata. Fungsi 'sorted' memastikan urutan abjad.
-            # Jadi ("ibu", "ayah") dianggap SAMA dengan ("ayah", "ibu").
-            pair = tuple(sorted((target, neighbor))) 
-            
-            # Jika pasangan ini sudah pernah dicatat di buku (dictionary):
-            if pair in co_occurrences:
-                # Tambahkan skor frekuensinya +1.
-                co_occurrences[pair] += 1
-            # Jika belum pernah dicatat:
+    vocab, A = build_cooccurrence_matrix(words, window_size)
+    return cooccurrence_to_networkx(vocab, A)
+
+# Batas atas slider Window Size. Indeks di bawah menyiapkan hitungan untuk SEMUA window 1..MAX_WINDOW_SIZE.
+MAX_WINDOW_SIZE = 5
+
+# Total byte array-array di dalam matriks sparse CSR.
+def _csr_nbytes(A):
+    return A.data.nbytes + A.indices.nbytes + A.indptr.nbytes
+
+# Indeks co-occurrence untuk semua ukuran window sekaligus.
+# Token dipindai SEKALI, lalu setiap pasangan kata dicatat menurut JARAK-nya (1, 2, ..., MAX_WINDOW_SIZE).
+# Graph untuk window w tinggal menjumlahkan ember (bucket) jarak 1..w, tanpa memindai ulang teks.
+# Setelah bucket jadi, token tidak disimpan lagi: cukup jumlahnya dan max_window token terakhir (untuk tail()).
+class CooccurrenceIndex:
+    def __init__(self, words, max_window=MAX_WINDOW_SIZE):
+        self.vocab, codes = encode_tokens(words)
+        self.max_window = max_window
+        self.count = len(codes)
+        self.last_codes = codes[-max_window:].copy()
+        # by_distance[d] = matriks segitiga atas jumlah pasangan yang berjarak tepat d kata.
+        self.by_distance = [None] + [
+            _distance_pairs(codes, d, 0, len(codes), len(self.vocab))
+            for d in range(1, max_window + 1)
+        ]
+
+    # Membangun indeks dari potongan-potongan list kata (lihat CooccurrenceCounter), hasilnya identik
+    # dengan CooccurrenceIndex(gabungan semua potongan).
+    @classmethod
+    def from_chunks(cls, chunks, max_window=MAX_WINDOW_SIZE):
+        counter = CooccurrenceCounter(max_window)
+        for words in chunks:
+            counter.update(words)
+        return counter.finish()
+
+    # Koreksi ekor: build_graph hanya memakai kata target i < n - window_size, jadi pasangan yang
+    # targetnya ada di window_size kata terakhir harus dikurangi dari jumlah bucket (segitiga atas).
+    # Pasangan tersebut hanya melibatkan window_size kata terakhir, jadi cukup dihitung dari last_codes.
+    def tail(self, window_size):
+        n = len(self.last_codes)
+        upper = sp.csr_matrix((len(self.vocab), len(self.vocab)), dtype=np.int32)
+        for d in range(1, window_size + 1):
+            upper = upper + _distance_pairs(self.last_codes, d, max(0, n - window_size), n, len(self.vocab))
+        return upper
+
+    # Matriks ketetanggaan simetris untuk window tertentu, identik dengan build_cooccurrence_matrix(words, window_size).
+    def matrix(self, window_size):
+        window_size = min(window_size, self.max_window)
+        upper = self.by_distance[1]
+        # Jumlah kumulatif bucket jarak 1..window_size.
+        for d in range(2, window_size + 1):
+            upper = upper + self.by_distance[d]
+        return _symmetric(upper - self.tail(window_size))
+
+    # Perkiraan memori indeks (byte): bucket CSR dan string kosakata (dihitung sekali).
+    def nbytes(self):
+        if not hasattr(self, '_vocab_bytes'):
+            self._vocab_bytes = self.vocab.nbytes + sum(map(sys.getsizeof, self.vocab))
+        return self._vocab_bytes + self.last_codes.nbytes + sum(_csr_nbytes(A) for A in self.by_distance[1:])
+
+    # Membuat objek Graph NetworkX untuk window tertentu (pengganti build_graph tanpa memindai teks).
+    def graph(self, window_size):
+        return cooccurrence_to_networkx(self.vocab, self.matrix(window_size))
+
+# Penghitung co-occurrence bertahap (streaming): kata masuk per potongan (misal per halaman PDF) dan
+# langsung dihitung ke bucket jarak 1..max_window, lalu potongannya dibuang. Konteks max_window token
+# terakhir dibawa ke potongan berikutnya, jadi pasangan yang melewati batas potongan tetap terhitung.
+# Memori sebanding dengan kosakata & jumlah pasangan kata unik, bukan panjang dokumen.
+class CooccurrenceCounter:
+    # Jumlah pasangan yang ditampung sebelum digabung ke matriks CSR (membatasi memori penampung).
+    FLUSH_PAIRS = 1 << 20
+
+    def __init__(self, max_window=MAX_WINDOW_SIZE):
+        self.max_window = max_window
+        self.ids = {}                                   # Kata -> ID (urut kemunculan pertama, sama seperti encode_tokens).
+        self.count = 0
+        self.context = np.empty(0, dtype=np.int32)      # max_window token terakhir dari potongan sebelumnya.
+        self.by_distance = [None] + [sp.csr_matrix((0, 0), dtype=np.int32) for _ in range(max_window)]
+        self._rows = [[] for _ in range(max_window + 1)]
+        self._cols = [[] for _ in range(max_window + 1)]
+        self._pending = 0
+
+    def update(self, words):
+        if not words:
+            return
+        # ID lokal potongan ini -> ID global. Loop Python hanya atas kata unik potongan ini.
+        local, uniques = pd.factorize(np.asarray(words, dtype=object))
+        ids = self.ids
+        mapping = np.fromiter((ids.setdefault(word, len(ids)) for word in uniques), dtype=np.int32, count=len(uniques))
+        extended = np.concatenate([self.context, mapping[local]])
+        offset = len(self.context)
+        for d in range(1, self.max_window + 1):
+            # Hanya pasangan yang kata keduanya ada di potongan baru (yang lain sudah dihitung sebelumnya).
+            start = max(0, offset - d)
+            stop = len(extended) - d
+            if stop <= start:
+                continue
+            targets = extended[start:stop]
+            neighbors = extended[start + d:]
+            # Pasangan kata dengan dirinya sendiri dilewati, sama seperti _distance_pairs.
+            keep = targets != neighbors
+            self._rows[d].append(np.minimum(targets, neighbors)[keep])
+            self._cols[d].append(np.maximum(targets, neighbors)[keep])
+            self._pending += int(np.count_nonzero(keep))
+        self.context = extended[-self.max_window:].copy()
+        self.count += len(local)
+        if self._pending >= self.FLUSH_PAIRS:
+            self._flush()
+
+    # Menggabungkan pasangan yang tertampung ke bucket CSR (kosakata bisa sudah bertambah: matriks diperbesar).
+    def _flush(self):
+        size = len(self.ids)
+        for d in range(1, self.max_window + 1):
+            upper = self.by_distance[d]
+            upper.resize((size, size))
+            if self._rows[d]:
+                rows = np.concatenate(self._rows[d])
+                cols = np.concatenate(self._cols[d])
+                upper = upper + sp.csr_matrix(
+                    (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(size, size)
+                )
+            self.by_distance[d] = upper
+            self._rows[d] = []
+            self._cols[d] = []
+        self._pending = 0
+
+    # Menyelesaikan hitungan dan mengembalikan CooccurrenceIndex.
+    def finish(self):
+        self._flush()
+        index = CooccurrenceIndex.__new__(CooccurrenceIndex)
+        index.vocab = np.array(list(self.ids), dtype=object)
+        index.max_window = self.max_window
+        index.count = self.count
+        index.last_codes = self.context
+        index.by_distance = self.by_distance
+        return index
+
+# Jumlah halaman minimal sebelum PDF diproses dengan jalur streaming (env PPW_STREAM_MIN_PAGES):
+# halaman -> token -> co-occurrence per potongan, tanpa pernah memegang seluruh token di memori.
+# Kedua jalur memakai ekstraksi paralel yang sama (iter_pdf_pages); PDF yang lebih pendek memakai
+# jalur biasa karena token utuhnya kecil. 0 = selalu streaming.
+STREAM_MIN_PAGES = int(os.environ.get("PPW_STREAM_MIN_PAGES", "256"))
+
+# Jalur streaming: halaman PDF dikeluarkan satu per satu (urut, dibaca paralel untuk PDF panjang),
+# teks & token ditulis bertahap ke cache disk, dan kata langsung masuk ke CooccurrenceCounter.
+# Hasilnya identik dengan jalur biasa.
+def stream_document_index(pdf_bytes, digest=None, progress=None, cancel=None):
+    digest = digest or pdf_digest(pdf_bytes)
+    tokenizer = get_tokenizer()
+    counter = CooccurrenceCounter()
+    with track_stage('stream_index', digest), CacheWriter(digest) as writer:
+        # Teks setiap halaman ikut ditulis ke cache sebelum dibersihkan.
+        def pages():
+            for text in iter_pdf_pages(pdf_bytes, progress, cancel):
+                writer.write_text(text)
+                yield text
+        for words in tokenizer.tokenize_pages(pages()):
+            writer.write_tokens(words)
+            counter.update(words)
+        index = counter.finish()
+    return index
+
+# Mengambil CooccurrenceIndex sebuah PDF: dari token di cache disk (dibaca bertahap) jika ada,
+# selain itu dari PDF (jalur biasa, atau streaming untuk PDF panjang). pdf_bytes boleh None:
+# hanya cache yang dicoba, dan hasilnya None jika cache belum/tidak ada.
+def load_document_index(pdf_bytes, digest=None, progress=None, cancel=None):
+    digest = digest or pdf_digest(pdf_bytes)
+    chunks = iter_cached_tokens(digest)
+    if chunks is not None:
+        try:
+            with track_stage('cache_index', digest):
+                return CooccurrenceIndex.from_chunks(chunks)
+        except zlib.error:
+            # File cache rusak: hitung ulang dari PDF (cache-nya ikut ditulis ulang).
+            pass
+    if pdf_bytes is None:
+        return None
+    if pdf_page_count(pdf_bytes) >= STREAM_MIN_PAGES:
+        return stream_document_index(pdf_bytes, digest, progress, cancel)
+    words = load_document_tokens(pdf_bytes, digest, progress, cancel)[1]
+    _check_cancel(cancel)
+    with track_stage('cooccurrence_index', digest):
+        return CooccurrenceIndex(words)
+
+# Memindahkan matriks segitiga atas milik satu dokumen (ID kata lokal) ke ID kata korpus.
+# global_ids[i] = ID korpus untuk kata lokal i. Hasilnya tetap segitiga atas (ID kecil, ID besar).
+def _to_corpus_ids(upper, global_ids, size):
+    upper = upper.tocoo()
+    rows = global_ids[upper.row]
+    cols = global_ids[upper.col]
+    return sp.csr_matrix(
+        (upper.data, (np.minimum(rows, cols), np.maximum(rows, cols))), shape=(size, size), dtype=np.int32
+    )
+
+# Indeks co-occurrence GABUNGAN untuk banyak dokumen (mode korpus).
+# Menyimpan jumlah bucket jarak 1..max_window dan koreksi ekor setiap window dari semua dokumen,
+# dalam satu kosakata korpus. Menambah/menghapus satu paper cukup menambah/mengurangi kontribusi
+# paper tersebut (tanpa membangun ulang dari semua paper). Antarmukanya sama dengan CooccurrenceIndex
+# (vocab, matrix(window_size), nbytes()), jadi bisa diranking dan ditampilkan lewat CompactDocument.
+class CorpusIndex:
+    def __init__(self, max_window=MAX_WINDOW_SIZE):
+        self.max_window = max_window
+        self.word_ids = {}              # Kata -> ID korpus (hanya bertambah).
+        self.vocab = np.empty(0, dtype=object)
+        self.members = {}               # Nama file -> (digest, ID korpus untuk kosakata dokumen itu, jumlah kata).
+        self.count = 0                  # Total kata semua paper.
+        self.by_distance = [None] + [self._empty() for _ in range(max_window)]
+        self.tails = [None] + [self._empty() for _ in range(max_window)]
+        self._vocab_bytes = 0
+
+    def _empty(self):
+        return sp.csr_matrix((len(self.vocab), len(self.vocab)), dtype=np.int32)
+
+    def __contains__(self, name):
+        return name in self.members
+
+    # Sidik jari isi korpus (daftar paper + isinya): kunci cache layout & HTML untuk tampilan korpus.
+    @property
+    def digest(self):
+        key = "\n".join(f"{name}\t{self.members[name][0]}" for name in sorted(self.members))
+        return "corpus-" + hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    # Mendaftarkan kata baru ke kosakata korpus dan mengembalikan ID korpus untuk setiap kata dokumen.
+    def _global_ids(self, vocab):
+        new_words = [word for word in vocab if word not in self.word_ids]
+        if new_words:
+            for word in new_words:
+                self.word_ids[word] = len(self.word_ids)
+            self.vocab = np.concatenate([self.vocab, np.asarray(new_words, dtype=object)])
+            self._vocab_bytes += sum(map(sys.getsizeof, new_words)) + 8 * len(new_words)
+            # Matriks gabungan diperbesar mengikuti kosakata (isinya tidak berubah).
+            size = len(self.vocab)
+            for matrices in (self.by_distance, self.tails):
+                for d in range(1, self.max_window + 1):
+                    matrices[d].resize((size, size))
+        return np.fromiter((self.word_ids[word] for word in vocab), dtype=np.int32, count=len(vocab))
+
+    # Menjumlahkan (sign=1) atau mengurangkan (sign=-1) kontribusi satu dokumen.
+    def _apply(self, index, global_ids, sign):
+        size = len(self.vocab)
+        for d in range(1, self.max_window + 1):
+            contribution = _to_corpus_ids(index.by_distance[d], global_ids, size)
+            self.by_distance[d] = self.by_distance[d] + sign * contribution
+            contribution = _to_corpus_ids(index.tail(d), global_ids, size)
+            self.tails[d] = self.tails[d] + sign * contribution
+        if sign < 0:
+            for matrices in (self.by_distance, self.tails):
+                for d in range(1, self.max_window + 1):
+                    matrices[d].eliminate_zeros()
+
+    # Menambahkan paper (CooccurrenceIndex miliknya) ke korpus.
+    def add(self, name, digest, index):
+        global_ids = self._global_ids(index.vocab)
+        self._apply(index, global_ids, 1)
+        self.members[name] = (digest, global_ids, index.count)
+        self.count += index.count
+
+    # Mengurangkan kontribusi paper dari korpus. index = CooccurrenceIndex dari token yang sama
+    # seperti saat add (kosakata hasil encode_tokens selalu berurutan sama, jadi ID korpusnya tetap cocok).
+    def remove(self, name, index):
+        _, global_ids, count = self.members.pop(name)
+        self._apply(index, global_ids, -1)
+        self.count -= count
+        # Kata yang sudah tidak dipakai paper mana pun tetap di kosakata, tetapi tanpa relasi
+        # (skornya 0 dan tidak muncul di Graph/tabel).
+
+    # Matriks ketetanggaan simetris korpus = jumlah matriks setiap paper pada window yang sama.
+    def matrix(self, window_size):
+        window_size = min(window_size, self.max_window)
+        upper = self.by_distance[1]
+        for d in range(2, window_size + 1):
+            upper = upper + self.by_distance[d]
+        return _symmetric(upper - self.tails[window_size])
+
+    def nbytes(self):
+        return self._vocab_bytes + sum(
+            _csr_nbytes(A) for matrices in (self.by_distance, self.tails) for A in matrices[1:]
+        )
+
+# ==============================================================================
+# BAGIAN 9: FUNGSI PERINGKAT KATA (PAGERANK)
+# ==============================================================================
+
+# Parameter PageRank (nilainya sama dengan default nx.pagerank; arti tol lihat sparse_pagerank).
+# PAGERANK_TOL bisa dinaikkan untuk menukar sedikit ketelitian dengan waktu hitung yang lebih singkat
+# (lihat telemetri di halaman).
+PAGERANK_ALPHA = 0.85
+PAGERANK_TOL = 1.0e-6
+PAGERANK_MAX_ITER = 100
+# Mode Top-K: berhenti lebih awal jika urutan K kata teratas tidak berubah selama sekian iterasi berturut-turut.
+TOPK_STABLE_ITERS = 5
+# Jumlah kata teratas yang ditampilkan di grafik batang "Top Ranking".
+TOP_RANK_DISPLAY = 20
+
+# PageRank langsung di atas matriks sparse (CSR) dengan power iteration, tanpa objek Graph NetworkX.
+# Rumusnya sama dengan nx.pagerank(G, alpha, weight='weight'), tetapi syarat berhentinya lebih ketat:
+# iterasi berhenti jika total selisih |x - x_lama| < tol * (1 - alpha) / alpha. Karena satu langkah
+# power iteration memperkecil jarak ke solusi sebenarnya minimal dengan faktor alpha, setiap skor
+# dijamin berjarak < tol dari solusi sebenarnya, dari vektor awal APA PUN. Jadi hasil warm start dan
+# hasil mulai dari awal berbeda < 2 * tol per skor. (nx.pagerank berhenti lebih awal, saat total
+# selisih < N * tol, jadi skornya sendiri bisa meleset lebih dari tol: pada facebook_combined.txt
+# sekitar 6e-5.)
+# - nstart : vektor awal (panjang = jumlah baris A) untuk warm start dari hasil sebelumnya.
+# - top_k  : jika diisi, boleh berhenti lebih awal begitu urutan top_k kata sudah stabil
+#            (jaminan tol di atas hanya berlaku jika stats['converged'] True).
+# Mengembalikan (scores, stats): scores[i] = skor node i (0 untuk kata tanpa relasi),
+# stats = {'iterations', 'residual', 'seconds', 'converged'}.
+def sparse_pagerank(A, alpha=PAGERANK_ALPHA, tol=PAGERANK_TOL, max_iter=PAGERANK_MAX_ITER, nstart=None, top_k=None):
+    started = time.perf_counter()
+    A = sp.csr_matrix(A, dtype=np.float64)
+    scores = np.zeros(A.shape[0])
+
+    # Hanya kata yang punya relasi yang menjadi node Graph (sama seperti Graph hasil build_graph).
+    degree = np.asarray(A.sum(axis=1)).ravel()
+    active = np.flatnonzero(degree)
+    N = len(active)
+    if N == 0:
+        return scores, {'iterations': 0, 'residual': 0.0, 'seconds': time.perf_counter() - started, 'converged': True}
+
+    # Matriks transisi: setiap baris dibagi total bobotnya (peluang berpindah dari kata i ke kata j).
+    M = A[active][:, active]
+    out_weight = degree[active]
+    M = sp.diags(1.0 / out_weight) @ M
+
+    # Vektor awal: hasil sebelumnya (warm start) jika ada, selain itu rata 1/N.
+    if nstart is not None:
+        x = np.asarray(nstart, dtype=np.float64)[active].copy()
+        # Node yang baru muncul (belum punya skor lama) diberi nilai rata-rata.
+        x[x <= 0] = 1.0 / N
+        x /= x.sum()
+    else:
+        x = np.full(N, 1.0 / N)
+
+    teleport = (1.0 - alpha) / N
+    # Batas total selisih antar iterasi yang menjamin setiap skor < tol dari solusi sebenarnya.
+    stop_below = tol * (1.0 - alpha) / alpha if alpha > 0 else float('inf')
+    previous_top = None
+    stable = 0
+    converged = False
+    err = float('inf')
+    for iteration in range(1, max_iter + 1):
+        xlast = x
+        # Satu langkah power iteration: x = alpha * x M + (1 - alpha) / N.
+        # (Graph tak berarah dari co-occurrence tidak punya node "buntu"/dangling.)
+        x = alpha * (xlast @ M) + teleport
+        err = float(np.abs(x - xlast).sum())
+        if err < stop_below:
+            converged = True
+            break
+        if top_k:
+            # Ambil top_k teratas beserta urutannya; jika sama terus, hasil tampilan sudah tidak berubah.
+            k = min(top_k, N)
+            top = np.argpartition(-x, k - 1)[:k]
+            top = tuple(top[np.argsort(-x[top])])
+            stable = stable + 1 if top == previous_top else 0
+            previous_top = top
+            if stable >= TOPK_STABLE_ITERS:
+                break
+
+    scores[active] = x
+    stats = {
+        'iterations': iteration,
+        'residual': err,
+        'seconds': time.perf_counter() - started,
+        'converged': converged,
+    }
+    return scores, stats
+
+# Membuat DataFrame (Tabel) peringkat kata dari vektor skor PageRank: kolom ID, Kata, PageRank.
+def ranking_table(vocab, scores):
+    # Kata yang punya relasi = node Graph (skornya selalu > 0).
+    active = np.flatnonzero(scores)
+    df = pd.DataFrame({'Kata': vocab[active], 'PageRank': scores[active]})
+    # Urutkan dari nilai tertinggi ke terendah (stabil: skor sama tetap urut sesuai kemunculan).
+    df = df.sort_values(by='PageRank', ascending=False, kind='stable').reset_index(drop=True)
+    # Tambahkan kolom nomor urut (ID) di depan.
+    df.insert(0, 'ID', range(1, 1 + len(df)))
+    return df
+
+# ==============================================================================
+# BAGIAN 10: VISUALISASI GRAPH (LAYOUT & HTML)
+# ==============================================================================
+
+# Jumlah layout (posisi node) maksimal yang disimpan di memori untuk semua sesi.
+LAYOUT_CACHE_SIZE = 64
+# Jumlah HTML graph siap-kirim yang disimpan (satu HTML bisa ratusan KB, jadi batasnya lebih kecil).
+HTML_CACHE_SIZE = 16
+# Batas default jumlah node yang digambar. Dokumen yang lebih besar hanya menampilkan node PageRank tertinggi.
+GRAPH_NODE_BUDGET = 300
+# Pada mode ringkas (level of detail), setiap node hanya membawa sekian edge terkuatnya.
+GRAPH_EDGES_PER_NODE = 5
+
+# Cache LRU sederhana (yang paling lama tidak dipakai dibuang lebih dulu).
+# Kunci selalu diawali sidik jari dokumen. Dipakai bersama oleh semua sesi, jadi setiap akses dijaga dengan lock.
+class LRUCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                # Tandai baru dipakai (pindah ke paling belakang antrean).
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            # Buang isi yang paling lama tidak dipakai jika melebihi batas.
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # Isi terakhir milik dokumen yang sama (misal layout untuk window lain).
+    def latest_for(self, digest):
+        with self._lock:
+            for key in reversed(self._entries):
+                if key[0] == digest:
+                    return self._entries[key]
+        return None
+
+# Cache layout spring: kunci = (sidik jari dokumen, window, batas node, mode top-k).
+@st.cache_resource
+def get_layout_cache():
+    return LRUCache(LAYOUT_CACHE_SIZE)
+
+# Cache HTML graph: kunci = (sidik jari dokumen, window, batas node, mode top-k).
+@st.cache_resource
+def get_html_cache():
+    return LRUCache(HTML_CACHE_SIZE)
+
+# Mengambil bagian Graph yang akan digambar (level of detail).
+# Jika jumlah node <= max_nodes, Graph dikembalikan utuh (tampilan sama seperti dulu).
+# Jika lebih, hanya max_nodes kata dengan PageRank tertinggi yang diambil, dan setiap kata
+# hanya membawa GRAPH_EDGES_PER_NODE edge terkuatnya supaya browser tidak berat.
+def select_render_graph(G, pr, max_nodes=GRAPH_NODE_BUDGET, edges_per_node=GRAPH_EDGES_PER_NODE):
+    if len(G) <= max_nodes:
+        return G
+
+    top_nodes = sorted(pr, key=pr.get, reverse=True)[:max_nodes]
+    sub = G.subgraph(top_nodes)
+    H = nx.Graph()
+    H.add_nodes_from(top_nodes)
+    for node in top_nodes:
+        # Urutkan tetangga berdasarkan bobot edge, ambil yang paling kuat saja.
+        strongest = sorted(sub[node].items(), key=lambda item: item[1]['weight'], reverse=True)[:edges_per_node]
+        for neighbor, attrs in strongest:
+            H.add_edge(node, neighbor, weight=attrs['weight'])
+    return H
+
+# Sama seperti select_render_graph(cooccurrence_to_networkx(vocab, A), pr, ...) tetapi langsung dari
+# matriks CSR dan vektor skor, tanpa membuat Graph lengkap. Hanya dipakai jika node > max_nodes.
+# Mengembalikan (H, top): top = indeks kosakata node H, urut dari PageRank tertinggi.
+def select_render_matrix(vocab, A, scores, max_nodes=GRAPH_NODE_BUDGET, edges_per_node=GRAPH_EDGES_PER_NODE):
+    active = np.flatnonzero(scores)
+    # Urutan stabil = urutan sorted(pr, key=pr.get, reverse=True) di select_render_graph.
+    top = active[np.argsort(-scores[active], kind='stable')[:max_nodes]]
+    labels = vocab[top].tolist()
+    # Kolom diurutkan menurut indeks kosakata: urutan tetangga yang sama dengan Graph NetworkX,
+    # jadi edge dengan bobot sama dipilih dengan cara yang sama.
+    columns = np.sort(top)
+    column_labels = vocab[columns].tolist()
+    sub = A[top][:, columns].tocsr()
+    sub.sort_indices()
+
+    H = nx.Graph()
+    H.add_nodes_from(labels)
+    for i, node in enumerate(labels):
+        start, stop = sub.indptr[i], sub.indptr[i + 1]
+        weights = sub.data[start:stop]
+        # Ambil tetangga dengan bobot edge paling kuat saja.
+        for j in np.argsort(-weights, kind='stable')[:edges_per_node]:
+            H.add_edge(node, column_labels[sub.indices[start + j]], weight=weights[j].item())
+    return H, top
+
+# Menghitung posisi (x, y) setiap titik (spring layout), memakai cache jika sudah pernah dihitung.
+# Jika dokumen yang sama sudah punya layout untuk window lain, posisi lama dipakai sebagai titik awal
+# sehingga layout baru lebih cepat selesai dan gambarnya tidak "melompat" saat slider digeser.
+# top_k ikut kunci karena mode cepat bisa memilih kumpulan node teratas yang berbeda.
+def compute_layout(G, digest, window_size, max_nodes, top_k=None):
+    cache = get_layout_cache()
+    key = (digest, window_size, max_nodes, top_k)
+    pos = cache.get(key)
+    # Layout dari cache hanya dipakai jika semua node punya posisi (skor yang hampir sama bisa membuat
+    # kumpulan node teratas sedikit berbeda); jika tidak, dihitung ulang dengan posisi lama sebagai awal.
+    if pos is not None and all(node in pos for node in G):
+        return pos
+
+    previous = pos or cache.latest_for(digest)
+    initial = {node: previous[node] for node in G if node in previous} if previous else {}
+    if initial:
+        # Mulai dari posisi lama: cukup sedikit iterasi untuk menyesuaikan edge yang berubah.
+        pos = nx.spring_layout(G, k=0.5, seed=42, pos=initial, iterations=20)
+    else:
+        pos = nx.spring_layout(G, k=0.5, seed=42)
+    cache.put(key, pos)
+    return pos
+
+# Membuat HTML interaktif (PyVis) langsung di memori, tanpa menulis file graph.html ke disk.
+# Node & edge langsung ditulis dalam format data PyVis: Network.from_nx/add_edge mengecek duplikat
+# dengan menelusuri seluruh daftar edge (kuadratik) dan juga mengubah atribut Graph aslinya.
+# rank_of = {kata: peringkat} yang sudah dihitung oleh CompactDocument.
+def render_graph_html(G, pr, rank_of, pos):
+    # Membuat kanvas visualisasi menggunakan PyVis.
+    net = pyvis_network.Network(height="600px", width="100%", bgcolor="#ffffff", font_color="black")
+
+    nodes = []
+    for word in G:
+        x, y = pos[word]
+        nodes.append({
+            'color': '#97c2fc',
+            'id': word,
+            'label': str(word),                     # Label harus teks (node edge list berupa angka).
+            'shape': 'dot',
+            'font': {'color': net.font_color},
+            'x': float(x) * 1000,                   # Koordinat X (dikali 1000 biar luas).
+            'y': float(y) * 1000,                   # Koordinat Y.
+            'physics': False,                       # Matikan simulasi fisika (biar graph diam/stabil).
+            'size': pr.get(word, 0.01) * 1000,      # Ukuran node sesuai skor (makin penting makin besar).
+            'title': f"Kata: {word}\nRank: {rank_of[word]}",  # Tooltip saat mouse diarahkan ke node.
+        })
+    net.nodes = nodes
+    net.node_ids = list(G)
+    net.node_map = {node['id']: node for node in nodes}
+    # Tebal garis = bobot co-occurrence (sama seperti from_nx).
+    net.edges = [{'width': weight, 'from': u, 'to': v} for u, v, weight in G.edges(data='weight')]
+
+    # Pastikan fisika mati total.
+    net.toggle_physics(False)
+    # Hasilkan HTML sebagai string (tidak ada file bersama yang bisa saling timpa antar sesi).
+    return net.generate_html()
+
+# Mengembalikan (html, jumlah_node_digambar) untuk dokumen yang sedang dilihat (CompactDocument).
+# HTML disimpan di cache, jadi kembali ke dokumen/window yang sama tinggal mengirim ulang HTML lama
+# (Graph NetworkX dokumen tersebut bahkan tidak perlu dibuat).
+def graph_view_html(doc, max_nodes):
+    key = (doc.digest, doc.window_size, max_nodes, doc.top_k)
+    cache = get_html_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Level of detail: dokumen besar hanya menggambar node PageRank tertinggi.
+    render_G, pr, rank_of = doc.render_graph(max_nodes)
+    # Posisi node diambil dari cache layout (atau dihitung jika belum ada).
+    with track_stage('layout', doc.digest):
+        pos = compute_layout(render_G, doc.digest, doc.window_size, max_nodes, doc.top_k)
+    with track_stage('render_html', doc.digest):
+        result = (render_graph_html(render_G, pr, rank_of, pos), len(render_G))
+    cache.put(key, result)
+    return result
+
+# ==============================================================================
+# BAGIAN 11: PENYIMPANAN DOKUMEN PER SESI (RINGKAS + BATAS MEMORI)
+# ==============================================================================
+
+# Batas memori (perkiraan) untuk semua dokumen milik SATU sesi, dalam MB (env PPW_SESSION_BUDGET_MB).
+# Jika terlampaui, dokumen yang paling lama tidak dilihat dikeluarkan dari memori. Tokennya tetap
+# ada di cache disk, jadi dokumen itu dimuat ulang (tanpa membaca PDF) saat dipilih lagi.
+SESSION_MEMORY_BUDGET = int(os.environ.get("PPW_SESSION_BUDGET_MB", "256")) * 1024 * 1024
+# Perkiraan kasar ukuran Graph NetworkX (dict di dalam dict) per node dan per edge (diukur dengan tracemalloc).
+GRAPH_NODE_BYTES = 400
+GRAPH_EDGE_BYTES = 300
+
+# Satu dokumen dalam bentuk ringkas:
+# - index     : CooccurrenceIndex (kosakata + bucket CSR per jarak)
+# - adjacency : matriks CSR untuk window yang sedang dipakai
+# - scores    : skor PageRank float32 (panjang = kosakata)
+# Graph NetworkX, dict PageRank, peringkat, dan DataFrame TIDAK disimpan permanen: dibuat saat
+# dibutuhkan, dan hanya untuk dokumen yang sedang tampil (release_views() membuangnya lagi).
+class CompactDocument:
+    def __init__(self, digest, count, index):
+        self.digest = digest            # Sidik jari isi file (kunci cache disk, layout, dan HTML).
+        self.count = count              # Jumlah kata.
+        self.window_size = None         # Window yang dipakai untuk adjacency & scores saat ini.
+        self.top_k = None
+        self.adjacency = None
+        self.scores = None
+        self.stats = None               # Telemetri PageRank: jumlah iterasi, residual, waktu.
+        self.last_viewed = time.monotonic()
+        self._views = {}
+        # CooccurrenceIndex (satu paper) atau CorpusIndex (gabungan). None = sudah dikeluarkan dari memori.
+        self.index = index
+
+    # True jika data dokumen sudah dikeluarkan dari memori (hanya tersisa nama, jumlah kata, skor).
+    @property
+    def evicted(self):
+        return self.index is None
+
+    # Mengeluarkan data besar dari memori. scores tetap disimpan (kecil) sebagai warm start:
+    # kosakata hasil muat ulang dari token yang sama selalu punya urutan yang sama.
+    def evict(self):
+        self.index = None
+        self.adjacency = None
+        self.window_size = None
+        self.release_views()
+
+    # Membuang Graph/DataFrame/dict yang dibuat untuk tampilan.
+    def release_views(self):
+        self._views = {}
+
+    # Menghitung adjacency + PageRank untuk window tertentu. Jika window tidak berubah, langsung kembali.
+    # top_k diisi jika cukup butuh urutan top_k kata teratas (mode cepat).
+    def rank(self, window_size, top_k=None):
+        if self.window_size == window_size and self.top_k == top_k:
+            return self
+        # Matriks dibuat dari indeks (penjumlahan bucket), bukan dari build_graph yang memindai ulang token.
+        with track_stage('cooccurrence_window', self.digest):
+            A = self.index.matrix(window_size)
+        # Hitung PageRank. Jika dokumen ini pernah diranking (window lain), mulai dari skor lama (warm start);
+        # syarat berhenti sparse_pagerank menjamin hasilnya tetap < tol dari solusi sebenarnya.
+        with track_stage('pagerank', self.digest):
+            scores, stats = sparse_pagerank(A, nstart=self.scores, top_k=top_k)
+        self.adjacency = A
+        self.scores = scores.astype(np.float32)
+        self.stats = stats
+        self.window_size = window_size
+        self.top_k = top_k
+        self.release_views()
+        return self
+
+    # Jumlah node Graph = kata yang punya relasi (tanpa membuat Graph).
+    @property
+    def node_count(self):
+        return int(np.count_nonzero(np.diff(self.adjacency.indptr)))
+
+    # Perkiraan memori dokumen ini (byte), termasuk tampilan yang sedang dibuat.
+    # include_index=False untuk tampilan korpus (CorpusIndex dihitung terpisah oleh DocumentStore).
+    def nbytes(self, include_index=True):
+        total = 0 if self.scores is None else self.scores.nbytes
+        if include_index and self.index is not None:
+            total += self.index.nbytes()
+        if self.adjacency is not None:
+            total += _csr_nbytes(self.adjacency)
+        if 'graph' in self._views:
+            G = self._views['graph']
+            total += G.number_of_nodes() * GRAPH_NODE_BYTES + G.number_of_edges() * GRAPH_EDGE_BYTES
+        if 'df' in self._views:
+            total += int(self._views['df'].memory_usage(deep=True).sum())
+        return total
+
+    # --- Tampilan (dibuat malas, hanya untuk dokumen yang sedang tampil) ---
+
+    # Skor PageRank sebagai dict {kata: skor}, hanya kata yang punya relasi.
+    @property
+    def pagerank(self):
+        if 'pagerank' not in self._views:
+            active = np.flatnonzero(self.scores)
+            self._views['pagerank'] = dict(zip(self.index.vocab[active].tolist(), self.scores[active].tolist()))
+        return self._views['pagerank']
+
+    # Tabel peringkat (ID, Kata, PageRank).
+    @property
+    def df(self):
+        if 'df' not in self._views:
+            self._views['df'] = ranking_table(self.index.vocab, self.scores)
+        return self._views['df']
+
+    # Indeks kata -> peringkat, supaya tooltip graph tidak perlu mencari di DataFrame satu per satu.
+    @property
+    def rank_of(self):
+        if 'rank_of' not in self._views:
+            self._views['rank_of'] = dict(zip(self.df['Kata'], self.df['ID'].tolist()))
+        return self._views['rank_of']
+
+    # Objek Graph NetworkX (untuk visualisasi).
+    @property
+    def graph(self):
+        if 'graph' not in self._views:
+            with track_stage('graph_build', self.digest):
+                self._views['graph'] = cooccurrence_to_networkx(self.index.vocab, self.adjacency)
+        return self._views['graph']
+
+    # Graph yang benar-benar digambar, beserta skor & peringkat node-nodenya: (G, pr, rank_of).
+    # Jika node lebih banyak dari max_nodes, node teratas dipilih langsung dari matriks CSR,
+    # jadi Graph lengkap (bisa jutaan edge untuk edge list) tidak pernah dibuat.
+    def render_graph(self, max_nodes):
+        if self.node_count <= max_nodes:
+            return self.graph, self.pagerank, self.rank_of
+        with track_stage('graph_build', self.digest):
+            G, top = select_render_matrix(self.index.vocab, self.adjacency, self.scores, max_nodes)
+        # Node G sudah urut dari PageRank tertinggi (sama seperti urutan tabel), jadi peringkat = posisi.
+        pr = dict(zip(G, self.scores[top].tolist()))
+        return G, pr, {node: rank for rank, node in enumerate(G, 1)}
+
+# Semua dokumen milik satu sesi (disimpan di st.session_state.paper_data), dengan batas memori.
+# Juga menyimpan indeks korpus (gabungan semua dokumen) yang ikut diperbarui setiap add/remove.
+class DocumentStore:
+    def __init__(self, budget=SESSION_MEMORY_BUDGET):
+        self.budget = budget
+        self.documents = {}             # Nama file -> CompactDocument (urut sesuai waktu diproses).
+        self.corpus = CorpusIndex()     # Co-occurrence gabungan semua dokumen (mode korpus).
+        self.corpus_view = None         # CompactDocument untuk tampilan korpus (dibuat saat dibutuhkan).
+
+    def __contains__(self, name):
+        return name in self.documents
+
+    def get(self, name):
+        return self.documents.get(name)
+
+    def names(self):
+        return list(self.documents)
+
+    # Menyimpan dokumen dan menambahkan kontribusinya ke korpus.
+    # Jika nama yang sama sudah ada (file diganti isinya), kontribusi lama dikurangkan dulu.
+    def add(self, name, doc):
+        if name in self.documents:
+            self.remove(name)
+        self.documents[name] = doc
+        with track_stage('corpus_update', doc.digest):
+            self.corpus.add(name, doc.digest, doc.index)
+
+    # Menghapus dokumen dan mengurangkan kontribusinya dari korpus.
+    def remove(self, name):
+        doc = self.documents.pop(name, None)
+        if doc is None:
+            return
+        index = self._restore(doc)
+        if index is None:
+            # Token paper ini sudah tidak bisa dibaca lagi: korpus dibangun ulang dari paper yang tersisa.
+            self._rebuild_corpus()
+            return
+        with track_stage('corpus_update', doc.digest):
+            self.corpus.remove(name, index)
+
+    # Memuat ulang indeks dokumen yang sudah dikeluarkan dari memori (dari cache disk, atau dari
+    # file upload `source` jika cache sudah terhapus). Mengembalikan indeksnya, atau None jika gagal.
+    def _restore(self, doc, source=None):
+        if not doc.evicted:
+            return doc.index
+        # Token dibaca bertahap dari cache disk (tanpa memuat seluruh token ke memori).
+        doc.index = load_document_index(source.getbuffer() if source is not None else None, doc.digest)
+        return doc.index
+
+    # Membangun ulang korpus dari semua dokumen (hanya jika kontribusi satu paper tidak bisa dikurangkan).
+    # Dokumen yang tokennya juga sudah hilang ikut dihapus.
+    def _rebuild_corpus(self):
+        self.corpus = CorpusIndex()
+        # ID kata korpus berubah, jadi skor korpus lama tidak bisa dipakai sebagai warm start.
+        self.corpus_view = None
+        for name, doc in list(self.documents.items()):
+            was_evicted = doc.evicted
+            index = self._restore(doc)
+            if index is None:
+                del self.documents[name]
+                continue
+            self.corpus.add(name, doc.digest, index)
+            if was_evicted:
+                doc.evict()
+
+    def nbytes(self):
+        total = self.corpus.nbytes() + sum(doc.nbytes() for doc in self.documents.values())
+        if self.corpus_view is not None:
+            total += self.corpus_view.nbytes(include_index=False)
+        return total
+
+    # Menyiapkan dokumen untuk ditampilkan: muat ulang jika sudah dikeluarkan dari memori, hitung
+    # window saat ini, buang tampilan dokumen lain, lalu tegakkan batas memori.
+    # source = file upload dengan nama yang sama (cadangan jika token sudah hilang dari cache disk).
+    # Mengembalikan None jika dokumen tidak bisa dimuat ulang.
+    def open(self, name, window_size, top_k=None, source=None):
+        doc = self.documents[name]
+        if self._restore(doc, source) is None:
+            return None
+        doc.last_viewed = time.monotonic()
+        doc.rank(window_size, top_k)
+        self._release_views_except(doc)
+        self.enforce_budget(keep=name)
+        return doc
+
+    # Menyiapkan tampilan korpus (Graph + PageRank gabungan semua dokumen).
+    # Matriks korpus sudah diperbarui setiap add/remove; di sini hanya PageRank yang dihitung ulang,
+    # dimulai dari skor korpus sebelumnya (warm start) karena biasanya hanya sedikit paper yang berubah.
+    def open_corpus(self, window_size, top_k=None):
+        digest = self.corpus.digest
+        previous = self.corpus_view
+        if previous is None or previous.digest != digest:
+            view = CompactDocument(digest, self.corpus.count, self.corpus)
+            if previous is not None and previous.scores is not None:
+                # Kosakata korpus hanya bertambah: skor lama tetap di posisi yang sama, kata baru diisi 0.
+                view.scores = np.zeros(len(self.corpus.vocab), dtype=np.float32)
+                view.scores[:len(previous.scores)] = previous.scores
+            self.corpus_view = view
+        self.corpus_view.rank(window_size, top_k)
+        self._release_views_except(self.corpus_view)
+        self.enforce_budget()
+        return self.corpus_view
+
+    # Hanya dokumen (atau korpus) yang sedang tampil yang boleh menyimpan Graph/DataFrame.
+    def _release_views_except(self, current):
+        for doc in [*self.documents.values(), self.corpus_view]:
+            if doc is not None and doc is not current:
+                doc.release_views()
+
+    # Mengeluarkan dokumen yang paling lama tidak dilihat sampai total memori di bawah batas.
+    # Dokumen `keep` (yang sedang tampil) tidak pernah dikeluarkan. Korpus tidak ikut dikeluarkan.
+    def enforce_budget(self, keep=None):
+        total = self.nbytes()
+        candidates = sorted(
+            (doc for name, doc in self.documents.items() if name != keep and not doc.evicted),
+            key=lambda doc: doc.last_viewed,
+        )
+        for doc in candidates:
+            if total <= self.budget:
+                break
+            before = doc.nbytes()
+            doc.evict()
+            total -= before - doc.nbytes()
+        return total
+
+# ==============================================================================
+# BAGIAN 12: ANTRIAN PEMROSESAN UPLOAD DI LATAR BELAKANG
+# ==============================================================================
+
+# Jumlah file yang diproses bersamaan (env PPW_INGEST_WORKERS), juga di mesin 1 core: tujuannya agar satu
+# PDF raksasa tidak menahan file-file kecil di belakangnya. Thread-nya dipakai bersama semua sesi
+# (bergiliran antar-sesi, lihat IngestScheduler); PDF panjang tetap dipecah lagi ke pool proses (BAGIAN 5).
+INGEST_WORKERS = int(os.environ.get("PPW_INGEST_WORKERS", "4"))
+# Selang waktu (detik) panel kemajuan diperbarui selama masih ada file yang diproses.
+INGEST_POLL_SECONDS = 1.0
+# Keterangan status job untuk panel kemajuan.
+INGEST_STATUS_LABELS = {
+    'queued': "menunggu giliran",
+    'extract': "membaca halaman",
+    'tokenize': "membersihkan teks",
+    'index': "membangun graph",
+}
+
+# Penjadwal job upload untuk SEMUA sesi: setiap sesi punya antrian sendiri (urut upload), dan setiap
+# worker yang kosong mengambil job dari sesi yang paling lama tidak dilayani (sesi yang baru datang
+# didahulukan), jadi sesi-sesi mendapat giliran bergantian (round-robin). Upload 30 paper
+# dari satu user tidak membuat upload satu file dari user lain menunggu semuanya selesai: paling lama
+# ia menunggu sampai salah satu job yang sedang berjalan selesai.
+class IngestScheduler:
+    def __init__(self, workers):
+        self._condition = threading.Condition()
+        self._queues = {}               # Kunci sesi -> deque job yang menunggu.
+        self._last_served = {}          # Kunci sesi -> nomor giliran terakhir sesi itu dilayani.
+        self._turn = 0
+        for number in range(workers):
+            threading.Thread(target=self._work, name=f"ppw-ingest-{number}", daemon=True).start()
+
+    def submit(self, session, job):
+        with self._condition:
+            self._queues.setdefault(session, deque()).append(job)
+            self._condition.notify()
+
+    # Jumlah job yang masih menunggu worker (semua sesi).
+    def backlog(self):
+        with self._condition:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _next_job(self):
+        with self._condition:
+            while not self._queues:
+                self._condition.wait()
+            session = min(self._queues, key=lambda key: self._last_served.get(key, -1))
+            queue = self._queues[session]
+            job = queue.popleft()
+            self._turn += 1
+            self._last_served[session] = self._turn
+            if not queue:
+                del self._queues[session]
+                del self._last_served[session]
+            return job
+
+    def _work(self):
+        while True:
+            # IngestJob.run() menangkap semua error sendiri, jadi thread worker tidak pernah mati.
+            self._next_job().run()
+
+# Penjadwal dibuat sekali untuk semua sesi (seperti pool proses PDF).
+@st.cache_resource(show_spinner=False)
+def get_ingest_scheduler(workers):
+    return IngestScheduler(workers)
+
+# Satu file upload yang diproses di latar belakang: ekstraksi -> token -> indeks co-occurrence -> PageRank awal.
+# Atribut status/halaman ditulis oleh thread worker dan hanya dibaca oleh skrip Streamlit.
+class IngestJob:
+    def __init__(self, name, digest, pdf_bytes, window_size, top_k):
+        self.name = name
+        self.digest = digest
+        self.window_size = window_size  # Window & top_k saat upload (dokumen dihitung ulang saat dibuka jika berubah).
+        self.top_k = top_k
+        # queued -> extract -> tokenize -> index -> done / empty / no_edges / error / cancelled
+        self.status = 'queued'
+        self.pages_done = 0
+        self.pages_total = None
+        self.document = None            # CompactDocument hasil (hanya jika status 'done').
+        self.error = None
+        self.records = []               # Record tahap dari thread worker (digabung ke panel diagnostik).
+        self.collected = False          # True setelah hasilnya diambil oleh skrip.
+        self.cancel_event = threading.Event()
+        self._done = threading.Event()
+        self._pdf_bytes = pdf_bytes     # Salinan isi file; dilepas begitu worker selesai.
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    # Membatalkan job: yang belum mulai langsung selesai begitu gilirannya tiba, yang sedang jalan
+    # berhenti di halaman berikutnya. Salinan file langsung dilepas.
+    def cancel(self):
+        self.cancel_event.set()
+        self._pdf_bytes = None
+
+    # Dipanggil iter_pdf_pages setiap ada halaman yang selesai dibaca.
+    def _progress(self, done, total):
+        self.pages_done = done
+        self.pages_total = total
+        if done == total:
+            self.status = 'tokenize'
+
+    # Dijalankan di thread worker. Semua error ditangkap dan dicatat di job (run() tidak pernah melempar).
+    def run(self):
+        # Setiap job dianggap satu "rerun" sendiri untuk instrumentasi.
+        _run_state.run_id = uuid.uuid4().hex[:8]
+        _run_state.records = self.records
+        # Ambil salinan file SEBELUM memeriksa pembatalan (cancel() mengosongkan _pdf_bytes setelah set event).
+        pdf_bytes, self._pdf_bytes = self._pdf_bytes, None
+        try:
+            _check_cancel(self.cancel_event)
+            self.status = 'extract'
+            # Indeks co-occurrence dari cache disk, atau dari PDF (PDF panjang lewat jalur streaming).
+            index = load_document_index(pdf_bytes, self.digest, self._progress, self.cancel_event)
+            del pdf_bytes
+            _check_cancel(self.cancel_event)
+            # Aturan yang sama seperti sebelumnya: teks dengan <= 5 kata dianggap kosong.
+            if index.count <= 5:
+                self.status = 'empty'
+                return
+            self.status = 'index'
+            doc = CompactDocument(self.digest, index.count, index).rank(self.window_size, self.top_k)
+            if doc.node_count > 0:
+                self.document = doc
+                self.status = 'done'
             else:
-                # Tulis baru dengan skor awal 1.
-                co_occurrences[pair] = 1
-                
-    # Membuat objek Graph kosong menggunakan library NetworkX.
-    G = nx.Graph() 
-    
-    # Loop isi dictionary co_occurrences untuk dimasukkan ke dalam Graph.
-    # u = kata pertama, v = kata kedua, weight = jumlah kemunculan bersama.
-    for (u, v), weight in co_occurrences.items():
-        # Menambahkan garis (edge) penghubung antara u dan v dengan bobot tertentu.
-        G.add_edge(u, v, weight=weight)
-        
-    # Mengembalikan objek Graph yang sudah jadi.
-    return G
+                self.status = 'no_edges'
+        except IngestCancelled:
+            self.status = 'cancelled'
+        except Exception as e:
+            self.status = 'error'
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            _run_state.records = None
+            self._done.set()
+
+# Antrian upload milik satu sesi (disimpan di st.session_state.ingest).
+class IngestQueue:
+    def __init__(self, session):
+        self.session = session          # Kunci giliran sesi ini di IngestScheduler.
+        self.jobs = {}                  # Nama file -> IngestJob (yang belum selesai atau yang gagal).
+        # True setelah ada upload baru: dokumen pertama yang selesai dari upload itu langsung ditampilkan.
+        self.follow = False
+        # file_id upload -> hash SHA-256 isinya. file_id berganti setiap kali file di-upload (ulang),
+        # jadi hash cukup dihitung sekali per upload, bukan di setiap rerun.
+        self.digests = {}
+
+    # Mencocokkan antrian dengan isi uploader: file baru (atau berganti isi) dikirim ke worker,
+    # job milik file yang sudah dihapus dari uploader dibatalkan.
+    def sync(self, uploaded_files, store, window_size, top_k):
+        uploads = {f.name: f for f in uploaded_files}
+        for name in [name for name in self.jobs if name not in uploads]:
+            self.jobs.pop(name).cancel()
+
+        # Lupakan hash milik upload yang sudah tidak ada di uploader.
+        file_ids = {f.file_id for f in uploads.values()}
+        self.digests = {file_id: digest for file_id, digest in self.digests.items() if file_id in file_ids}
+
+        for name, uploaded_file in uploads.items():
+            # Sidik jari isi file (bukan namanya) untuk kunci cache dan deteksi file yang diganti.
+            digest = self.digests.get(uploaded_file.file_id)
+            if digest is None:
+                digest = self.digests[uploaded_file.file_id] = pdf_digest(uploaded_file.getbuffer())
+            job = self.jobs.get(name)
+            if job is not None:
+                if job.digest == digest:
+                    continue
+                # Isi file berganti saat versi lamanya masih diproses.
+                self.jobs.pop(name).cancel()
+            # Perubahan Window Size TIDAK memicu proses ulang: indeks co-occurrence sudah memuat semua window.
+            saved = store.get(name)
+            if saved is not None and saved.digest == digest:
+                continue
+            # getvalue() = salinan: worker tetap aman walau file dihapus dari uploader di tengah jalan.
+            self.submit(name, digest, uploaded_file.getvalue(), window_size, top_k)
+            self.follow = True
+
+    def submit(self, name, digest, pdf_bytes, window_size, top_k):
+        # Tokenizer (stopwords) disiapkan di thread skrip, jadi loading-nya tampil di layar dan worker tinggal memakainya.
+        get_tokenizer()
+        job = IngestJob(name, digest, pdf_bytes, window_size, top_k)
+        get_ingest_scheduler(INGEST_WORKERS).submit(self.session, job)
+        self.jobs[name] = job
+        return job
+
+    # Mengambil job yang baru selesai (urut sesuai upload). Job yang berhasil dikeluarkan dari antrian;
+    # job yang gagal tetap disimpan agar peringatannya tetap tampil dan file-nya tidak diproses ulang.
+    def collect(self):
+        ready = [job for job in self.jobs.values() if job.finished and not job.collected]
+        for job in ready:
+            job.collected = True
+            if job.document is not None:
+                del self.jobs[job.name]
+        return ready
+
+    def pending(self):
+        return [job for job in self.jobs.values() if not job.finished]
+
+    # Job yang sudah selesai tetapi hasilnya belum diambil oleh collect().
+    def ready(self):
+        return [job for job in self.jobs.values() if job.finished and not job.collected]
+
+    def failures(self):
+        return [job for job in self.jobs.values() if job.collected]
+
+    def cancel_all(self):
+        for job in self.jobs.values():
+            job.cancel()
+        self.jobs = {}
+
+# Panel kemajuan per file & per halaman. Sebagai fragment, hanya panel ini yang diperbarui setiap
+# INGEST_POLL_SECONDS; begitu ada file yang selesai, seluruh aplikasi di-rerun agar dokumennya langsung bisa dipilih.
+@st.fragment(run_every=INGEST_POLL_SECONDS)
+def render_ingest_progress(queue):
+    if queue.ready():
+        st.rerun(scope="app")
+    pending = queue.pending()
+    if not pending:
+        return
+    st.caption(f"⏳ Memproses {len(pending)} file di latar belakang. File yang sudah selesai bisa langsung dilihat.")
+    for job in pending:
+        text = f"{job.name}: {INGEST_STATUS_LABELS.get(job.status, 'menyelesaikan')}"
+        if job.pages_total:
+            text += f" ({job.pages_done}/{job.pages_total} halaman)"
+        st.progress(job.pages_done / job.pages_total if job.pages_total else 0.0, text=text)
 
 # ==============================================================================
-# BAGIAN 7: PROGRAM UTAMA (MAIN LOOP)
+# BAGIAN 13: GRAPH EKSTERNAL DARI FILE EDGE LIST (GRAPH BESAR)
+# ==============================================================================
+
+# Contoh edge list yang ikut di repository (jaringan pertemanan Facebook, 88.234 edge).
+EDGE_LIST_SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "facebook_combined.txt")
+# File dibaca per potongan sebesar ini (dipotong di akhir baris), jadi teks file tidak pernah disalin utuh.
+EDGE_CHUNK_BYTES = 16 * 1024 * 1024
+# Jumlah baris tabel peringkat yang dikirim ke browser (graph besar bisa punya jutaan node).
+EDGE_TABLE_ROWS = 1000
+
+# Graph tak berarah dari edge list, dalam bentuk matriks CSR. Antarmukanya sama dengan CooccurrenceIndex
+# (vocab, matrix(window_size), nbytes()), jadi bisa diranking & ditampilkan lewat CompactDocument.
+# vocab = ID node asli dari file (int64), adjacency[i, j] = 1 jika node i dan j terhubung.
+class EdgeListGraph:
+    def __init__(self, node_ids, adjacency):
+        self.vocab = node_ids
+        self.adjacency = adjacency
+        # Edge unik: setiap edge biasa tersimpan dua kali (i,j) & (j,i), self-loop sekali.
+        self_loops = int(np.count_nonzero(adjacency.diagonal()))
+        self.edge_count = (adjacency.nnz - self_loops) // 2 + self_loops
+
+    # Edge list tidak punya window: matriksnya selalu sama.
+    def matrix(self, window_size):
+        return self.adjacency
+
+    def nbytes(self):
+        return self.vocab.nbytes + _csr_nbytes(self.adjacency)
+
+# Memotong buffer (mmap / memoryview) menjadi potongan ~chunk_bytes yang selalu berakhir di akhir baris.
+def iter_edge_chunks(buffer, chunk_bytes=EDGE_CHUNK_BYTES):
+    size = len(buffer)
+    pos = 0
+    while pos < size:
+        chunk = bytes(buffer[pos:pos + chunk_bytes])
+        if pos + len(chunk) < size:
+            cut = chunk.rfind(b"\n") + 1
+            # Satu baris lebih panjang dari chunk_bytes: sambung sampai akhir baris itu (baris tidak boleh
+            # terbelah, karena setiap baris diparse sebagai satu edge).
+            while not cut and pos + len(chunk) < size:
+                more = bytes(buffer[pos + len(chunk):pos + len(chunk) + chunk_bytes])
+                newline = more.find(b"\n")
+                chunk += more if newline < 0 else more[:newline + 1]
+                cut = len(chunk) if newline >= 0 else 0
+            chunk = chunk[:cut] if cut else chunk
+        pos += len(chunk)
+        yield chunk
+
+# Mengubah satu potongan teks "u v" per baris menjadi array int64 berbentuk (jumlah_edge, 2).
+# Diparse per baris oleh np.loadtxt (di C): tidak ada objek Python per edge. Baris kosong dan
+# komentar ('#', seperti header file SNAP) dilewati. Baris dengan jumlah kolom selain dua ditolak,
+# termasuk edge list berbobot "u v bobot" (bobotnya tidak dipakai, jadi lebih baik diberi tahu).
+def _parse_edge_chunk(chunk):
+    with warnings.catch_warnings():
+        # Potongan berisi komentar/baris kosong saja: NumPy hanya memberi peringatan "no data".
+        warnings.simplefilter("ignore", UserWarning)
+        try:
+            values = np.loadtxt(io.BytesIO(chunk), dtype=np.int64, comments="#", ndmin=2)
+        except ValueError:
+            # Teks bukan angka, atau jumlah kolom berbeda antar baris (pesan NumPy berbahasa Inggris).
+            raise ValueError("setiap baris harus berisi tepat dua ID node (angka bulat)") from None
+    if values.size == 0:
+        return np.empty((0, 2), dtype=np.int32)
+    if values.shape[1] != 2:
+        note = " (edge list berbobot tidak didukung)" if values.shape[1] > 2 else ""
+        raise ValueError(f"setiap baris harus berisi tepat dua ID node, bukan {values.shape[1]} kolom{note}")
+    # ID node hampir selalu muat di int32: separuh memori dibanding int64.
+    if len(values) and 0 <= values.min() and values.max() <= np.iinfo(np.int32).max:
+        values = values.astype(np.int32)
+    return values.reshape(-1, 2)
+
+# Memadatkan ID node asli (bisa besar & tidak berurutan) menjadi 0..n-1.
+# Mengembalikan (node_ids, codes): node_ids[codes] == values, codes bertipe int32.
+def _compact_node_ids(values):
+    if len(values) and values.min() >= 0 and values.max() < 4 * values.size + 1024:
+        # ID cukup rapat (kasus umum, misalnya 0..n-1): tabel penanda, tanpa mengurutkan semua edge.
+        present = np.zeros(int(values.max()) + 1, dtype=bool)
+        present[values] = True
+        lookup = np.cumsum(present, dtype=np.int32) - 1
+        return np.flatnonzero(present), lookup[values]
+    node_ids, codes = np.unique(values, return_inverse=True)
+    return node_ids, codes.reshape(values.shape).astype(np.int32)
+
+# Membaca edge list (dua ID node bilangan bulat per baris, dipisah spasi/tab, komentar '#')
+# menjadi EdgeListGraph. source = path file (dibaca lewat mmap) atau bytes / memoryview (file upload).
+# Edge ganda dan arah edge diabaikan (sama seperti nx.read_edgelist ke nx.Graph).
+def load_edge_list(source, chunk_bytes=EDGE_CHUNK_BYTES):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return load_edge_list(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return load_edge_list(mapped, chunk_bytes)
+
+    parts = [_parse_edge_chunk(chunk) for chunk in iter_edge_chunks(source, chunk_bytes)]
+    edges = np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.int32)
+    del parts
+    node_ids, codes = _compact_node_ids(edges)
+    del edges
+    n = len(node_ids)
+    # Setiap edge dimasukkan dua arah sekaligus (graph tak berarah), tanpa A + A.T yang membuat salinan.
+    rows = np.concatenate([codes[:, 0], codes[:, 1]])
+    cols = np.concatenate([codes[:, 1], codes[:, 0]])
+    del codes
+    A = sp.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n, n))
+    # Graph tanpa bobot: edge ganda (atau dua arah) tetap bernilai 1.
+    A.data[:] = 1
+    return EdgeListGraph(node_ids, A)
+
+# Menampilkan analisis edge list (PageRank + Top ranking + Graph node teratas) di area utama.
+# source = file upload, atau None untuk memakai EDGE_LIST_SAMPLE.
+def render_edge_list_view(source, top_k, max_nodes):
+    if source is not None:
+        name = source.name
+        key = f"upload:{source.file_id}"
+    else:
+        name = os.path.basename(EDGE_LIST_SAMPLE)
+        stat = os.stat(EDGE_LIST_SAMPLE)
+        key = f"file:{EDGE_LIST_SAMPLE}:{stat.st_size}:{stat.st_mtime_ns}"
+    digest = "edges-" + hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    st.divider()
+    st.subheader(f"🌐 Graph Edge List: {name}")
+
+    # Graph hanya dibaca sekali per file (disimpan di session state), slider lain tidak memicu baca ulang.
+    doc = st.session_state.get('edge_graph')
+    if doc is None or doc.digest != digest:
+        # Lepaskan graph lama dulu supaya dua graph besar tidak ada di memori bersamaan.
+        st.session_state.edge_graph = None
+        try:
+            with st.spinner(f"Memuat {name}..."), track_stage('edge_list_load', digest):
+                graph = load_edge_list(source.getbuffer() if source is not None else EDGE_LIST_SAMPLE)
+        except ValueError as e:
+            st.error(f"File {name} bukan edge list yang valid: {e}")
+            return
+        doc = CompactDocument(digest, graph.edge_count, graph)
+        st.session_state.edge_graph = doc
+    doc.rank(1, top_k)
+
+    st.success(f"Node: {doc.node_count} | Edge: {doc.count}")
+    stats = doc.stats
+    st.caption(
+        f"PageRank: {stats['iterations']} iterasi | residual {stats['residual']:.2e} | "
+        f"{stats['seconds'] * 1000:.1f} ms" + ("" if stats['converged'] else " (berhenti lebih awal)")
+    )
+    if doc.node_count == 0:
+        return
+
+    col_graph, col_stats = st.columns([3, 2])
+    with col_graph:
+        st.subheader("🕸️ Graph (Node Teratas)")
+        try:
+            html_source, shown_nodes = graph_view_html(doc, max_nodes)
+            if shown_nodes < doc.node_count:
+                st.caption(f"Menampilkan {shown_nodes} dari {doc.node_count} node (PageRank tertinggi).")
+            components.html(html_source, height=620)
+        except Exception as e:
+            st.error(f"Error: {e}")
+    with col_stats:
+        # Kolom 'Kata' berisi ID node; ditampilkan sebagai teks agar grafik batang tidak menganggapnya angka.
+        df = doc.df.head(EDGE_TABLE_ROWS).rename(columns={'Kata': 'Node'})
+        df['Node'] = df['Node'].astype(str)
+        st.subheader("📊 Top Ranking")
+        st.bar_chart(df.head(TOP_RANK_DISPLAY).set_index('Node')['PageRank'])
+        st.divider()
+        st.subheader("📋 PageRank")
+        if doc.node_count > EDGE_TABLE_ROWS:
+            st.caption(f"{EDGE_TABLE_ROWS} node teratas dari {doc.node_count}.")
+        st.dataframe(df, use_container_width=True, height=300, hide_index=True)
+
+# ==============================================================================
+# BAGIAN 14: PROGRAM UTAMA (MAIN LOOP)
 # ==============================================================================
 
 # Fungsi utama yang akan dijalankan oleh Streamlit.
 def main():
-    # Menjalankan fungsi download data bahasa (yang di-cache di atas).
-    download_nltk_data() 
+    # Mengatur halaman web (harus menjadi perintah Streamlit pertama).
+    configure_page()
+    # Mulai mencatat waktu & memori setiap tahap untuk rerun ini.
+    run_records = begin_run()
+    # Waktu import saat skrip ini dimuat (besar hanya pada start pertama, setelah itu modul sudah di memori).
+    # Resource bahasa & library berat TIDAK dimuat di sini, melainkan saat tahap yang membutuhkannya berjalan.
+    record_stage('import', IMPORT_SECONDS)
     
     # --- SETUP MEMORI (SESSION STATE) ---
     # Bagian ini penting untuk menyimpan data antar-klik (state management).
     
     # Cek: Apakah laci 'paper_data' sudah ada di memori?
     if 'paper_data' not in st.session_state:
-        # Jika belum, buat dictionary kosong untuk menyimpan data setiap paper secara terpisah.
-        st.session_state.paper_data = {}
+        # Jika belum, buat penyimpanan dokumen kosong (ringkas + batas memori per sesi).
+        st.session_state.paper_data = DocumentStore()
         
     # Cek: Apakah variabel 'active_file_key' sudah ada?
     # Variabel ini gunanya untuk mencatat: "File mana yang sedang dilihat user sekarang?"
@@ -210,6 +2180,14 @@ def main():
         # Jika belum, set ke None (belum ada yang dilihat).
         st.session_state.active_file_key = None
 
+    # Kunci unik sesi ini (giliran antrian upload & status diagnostik bersama di MemoryTracer).
+    if 'session_key' not in st.session_state:
+        st.session_state.session_key = uuid.uuid4().hex
+
+    # Antrian pemrosesan upload di latar belakang milik sesi ini.
+    if 'ingest' not in st.session_state:
+        st.session_state.ingest = IngestQueue(st.session_state.session_key)
+
     # Menampilkan Judul Aplikasi di layar utama.
     st.title("Analisis Paper PDF Dinamis")
     # Menampilkan deskripsi singkat.
@@ -234,97 +2212,88 @@ def main():
         # Membuat Slider untuk mengatur Window Size.
         # Jika user menggeser slider ini, Streamlit akan me-rerun kode dari atas.
         # MODIFIKASI: Default value diubah dari 2 menjadi 1
-        window_size = st.slider("Jarak Hubungan Kata (Window Size)", 1, 5, 1)
+        window_size = st.slider("Jarak Hubungan Kata (Window Size)", 1, MAX_WINDOW_SIZE, 1)
         # Menampilkan info kecil.
         st.info("Geser slider untuk melihat perubahan graph.")
+        
+        # Mode cepat: PageRank berhenti begitu urutan Top-20 stabil (skor di tabel lengkap jadi perkiraan).
+        fast_rank = st.checkbox("Mode Cepat (hanya Top 20 yang akurat)", value=False)
+        top_k = TOP_RANK_DISPLAY if fast_rank else None
+        
+        # Batas jumlah node yang digambar di Word Graph (dokumen besar diringkas ke node terpenting).
+        max_nodes = st.slider("Maks. Node di Graph", 20, 2000, GRAPH_NODE_BUDGET, step=20)
+        
+        # Mode korpus: satu Graph + PageRank gabungan dari SEMUA paper yang sudah diproses.
+        corpus_mode = st.checkbox("Mode Korpus (gabungan semua paper)", value=False)
+        
+        # Panel diagnostik: menampilkan waktu, CPU dan memori setiap tahap (untuk melacak "aplikasi lambat").
+        show_diagnostics = st.checkbox("Tampilkan Diagnostik", value=False)
+        # Pengukuran puncak memori Python hanya aktif selama ada sesi yang menyalakan diagnostik (ada sedikit overhead).
+        get_memory_tracer().set_enabled(st.session_state.session_key, show_diagnostics)
+        
+        # Graph eksternal: file edge list ("u v" per baris), misalnya jaringan sosial dengan jutaan edge.
+        # PageRank, Mode Cepat, dan Maks. Node di atas juga berlaku untuk graph ini.
+        st.divider()
+        st.header("3. Graph Edge List")
+        edge_file = st.file_uploader("Upload Edge List (.txt, dua ID node per baris)", type=["txt", "edges", "tsv"])
+        use_edge_sample = edge_file is None and os.path.exists(EDGE_LIST_SAMPLE) and st.checkbox(
+            f"Pakai contoh {os.path.basename(EDGE_LIST_SAMPLE)}", value=False
+        )
 
     # --- LOGIKA UTAMA: MEMPROSES DATA ---
     
     # Jika user sudah mengupload minimal satu file:
     if uploaded_files:
-        # Lakukan loop untuk setiap file yang ada di uploader.
-        for uploaded_file in uploaded_files:
-            # Ambil nama filenya (misal: "JurnalA.pdf").
-            file_name = uploaded_file.name 
-            
-            # --- TAHAP PENENTUAN: APAKAH FILE INI PERLU DIPROSES? ---
-            # Kita buat variabel penanda (flag), awalnya False (jangan proses).
-            process_now = False 
-
-            # KONDISI 1: Cek apakah file ini belum pernah ada di memori 'paper_data'?
-            if file_name not in st.session_state.paper_data:
-                # Jika belum ada (file baru), maka WAJIB DIPROSES.
-                process_now = True
-            else:
-                # KONDISI 2: File sudah ada, tapi apakah settingan Window Size berubah?
-                # Kita ambil window_size yang DULU disimpan saat pemrosesan terakhir.
-                saved_window = st.session_state.paper_data[file_name].get('window_size', 0)
-                
-                # Bandingkan: Apakah window_size slider (sekarang) BEDA dengan simpanan (lama)?
-                if saved_window != window_size:
-                    # Jika beda, berarti user minta update graph. WAJIB PROSES ULANG.
-                    process_now = True 
-
-            # --- EKSEKUSI PEMROSESAN (JIKA process_now ADALAH TRUE) ---
-            if process_now:
-                # Tampilkan animasi loading dengan pesan yang sesuai.
-                with st.spinner(f"Memproses {file_name} (Window Size: {window_size})..."):
-                    
-                    # --- OPTIMASI: MENGHINDARI BACA ULANG PDF ---
-                    # Cek: Apakah teks mentah (raw_text) file ini sudah ada di memori?
-                    if file_name in st.session_state.paper_data and 'raw_text' in st.session_state.paper_data[file_name]:
-                        # Jika sudah ada (karena file lama yang cuma digeser slidernya), pakai teks dari RAM.
-                        raw_text = st.session_state.paper_data[file_name]['raw_text']
-                    else:
-                        # Jika ini benar-benar file baru, ekstrak teks dari PDF fisik.
-                        raw_text = extract_text_from_pdf(uploaded_file)
-                    
-                    # 1. Jalankan fungsi pembersihan teks.
-                    words = process_text(raw_text)
-                    
-                    # Validasi: Pastikan hasil kata lebih dari 5 (bukan PDF kosong/gambar).
-                    if len(words) > 5:
-                        # 2. Jalankan fungsi buat Graph (menggunakan window_size TERBARU dari slider).
-                        G = build_graph(words, window_size)
-                        
-                        # Validasi: Pastikan Graph punya node/titik.
-                        if len(G.nodes) > 0:
-                            # 3. Hitung algoritma PageRank untuk mencari kata terpenting.
-                            pr = nx.pagerank(G, alpha=0.85)
-                            
-                            # 4. Buat DataFrame (Tabel) dari hasil PageRank.
-                            df = pd.DataFrame(list(pr.items()), columns=['Kata', 'PageRank'])
-                            # Urutkan dari nilai tertinggi ke terendah.
-                            df = df.sort_values(by='PageRank', ascending=False).reset_index(drop=True)
-                            # Tambahkan kolom nomor urut (ID) di depan.
-                            df.insert(0, 'ID', range(1, 1 + len(df))) 
-                            
-                            # 5. SIMPAN SEMUA HASIL KE MEMORI (SESSION STATE)
-                            # Kita update isi laci dengan data terbaru.
-                            st.session_state.paper_data[file_name] = {
-                                'graph': G,                 # Simpan objek Graph.
-                                'pagerank': pr,             # Simpan skor PageRank.
-                                'df': df,                   # Simpan Tabel.
-                                'count': len(words),        # Simpan jumlah kata.
-                                'raw_text': raw_text,       # Simpan teks mentah (cache) biar hemat waktu nanti.
-                                'window_size': window_size  # PENTING: Simpan angka slider yang dipakai saat ini.
-                            }
-                            
-                            # 6. AUTO SWITCH FITUR
-                            # Paksa tampilan aplikasi untuk langsung pindah ke file yang baru saja diproses ini.
-                            st.session_state.active_file_key = file_name
-                            
-                        else:
-                            # Tampilkan warning jika graph gagal dibuat.
-                            st.warning(f"File {file_name} kurang relasi kata.")
-                    else:
-                        # Tampilkan warning jika teks terlalu sedikit.
-                        st.warning(f"File {file_name} teksnya kosong.")
+        store = st.session_state.paper_data
+        ingest = st.session_state.ingest
+
+        # --- TAHAP PENENTUAN & PENGIRIMAN KE ANTRIAN ---
+        # File yang belum pernah diproses (atau namanya sama tapi isinya berbeda) dikirim ke worker di
+        # latar belakang; skrip tidak menunggu, jadi dokumen lain tetap bisa dilihat selama proses berjalan.
+        # File yang dihapus dari uploader di tengah proses langsung dibatalkan.
+        ingest.sync(uploaded_files, store, window_size, top_k)
+
+        # --- MENGAMBIL HASIL YANG SUDAH SELESAI ---
+        for job in ingest.collect():
+            # Waktu & memori tahap-tahap di worker ikut tampil di panel diagnostik rerun ini.
+            run_records.extend(job.records)
+            if job.document is not None:
+                # SIMPAN HASIL KE MEMORI (SESSION STATE)
+                store.add(job.name, job.document)
+                # AUTO SWITCH FITUR: file pertama yang selesai dari upload terbaru langsung ditampilkan.
+                if ingest.follow:
+                    st.session_state.active_file_key = job.name
+                    ingest.follow = False
+
+        # Peringatan untuk file yang gagal (tetap tampil selama file-nya masih ada di uploader).
+        for job in ingest.failures():
+            if job.status == 'empty':
+                st.warning(f"File {job.name} teksnya kosong.")
+            elif job.status == 'no_edges':
+                st.warning(f"File {job.name} kurang relasi kata.")
+            elif job.status == 'error':
+                st.error(f"File {job.name} gagal diproses: {job.error}")
+
+        # Kemajuan file yang masih diproses (diperbarui otomatis tanpa menjalankan ulang seluruh halaman).
+        # Job yang selesai SETELAH collect() di atas juga harus memicu fragment, karena hanya fragment ini
+        # yang memanggil st.rerun: tanpa itu hasilnya baru muncul saat user menyentuh widget.
+        if ingest.pending() or ingest.ready():
+            render_ingest_progress(ingest)
+
+        # Paper yang sudah dihapus dari uploader ikut dihapus dari memori (kontribusinya di korpus dikurangkan).
+        uploaded_names = {f.name for f in uploaded_files}
+        for name in st.session_state.paper_data.names():
+            if name not in uploaded_names:
+                st.session_state.paper_data.remove(name)
+
+        # Tegakkan batas memori sesi: dokumen yang paling lama tidak dilihat dikeluarkan dari memori.
+        st.session_state.paper_data.enforce_budget(keep=st.session_state.active_file_key)
 
         # --- LOGIKA TAMPILAN (VIEW) ---
         
         # Ambil daftar semua nama file yang datanya sudah siap di memori.
-        processed_files = list(st.session_state.paper_data.keys())
+        store = st.session_state.paper_data
+        processed_files = store.names()
         
         # Jika daftar file tidak kosong (ada data):
         if processed_files:
@@ -345,27 +2314,52 @@ def main():
             selected_file = st.sidebar.selectbox(
                 "Tampilkan Analisis Paper Yang Sudah Diproses:",
                 options=processed_files,
-                key='active_file_key' 
+                key='active_file_key',
+                # Tanda 💾: dokumen sudah dikeluarkan dari memori dan akan dimuat ulang dari cache saat dipilih.
+                format_func=lambda name: f"{name} 💾" if store.get(name).evicted and name != st.session_state.active_file_key else name,
+                # Di mode korpus semua paper ditampilkan bersama, jadi pilihan file tidak dipakai.
+                disabled=corpus_mode,
             )
+            # Tempat info pemakaian memori (diisi setelah dokumen yang dipilih selesai disiapkan).
+            memory_note = st.sidebar.empty()
             
             # Jika ada file yang dipilih:
             if selected_file:
-                # Ambil data SPESIFIK milik file tersebut dari laci memori.
-                data = st.session_state.paper_data[selected_file]
+                if corpus_mode:
+                    # Matriks gabungan sudah diperbarui saat paper ditambah/dihapus; tinggal PageRank (warm start).
+                    data = store.open_corpus(window_size, top_k)
+                    title = f"📚 Korpus: {len(processed_files)} paper"
+                else:
+                    # Ambil data SPESIFIK milik file tersebut dari laci memori.
+                    # Jika slider baru digeser, PageRank dihitung ulang HANYA untuk file yang sedang dilihat
+                    # (dari indeks, tanpa tokenisasi ulang). File lain menyusul saat dipilih.
+                    uploads = {f.name: f for f in uploaded_files}
+                    data = store.open(selected_file, window_size, top_k, source=uploads.get(selected_file))
+                    if data is None:
+                        # Token sudah hilang dari cache disk dan file-nya tidak ada lagi di uploader.
+                        store.remove(selected_file)
+                        st.warning(f"Data {selected_file} sudah dibuang dari memori. Upload ulang file tersebut.")
+                        st.stop()
+                    title = f"📄 File: {selected_file}"
                 
                 # Bongkar (unpack) data ke variabel masing-masing agar mudah dipakai.
-                G = data['graph']
-                pr = data['pagerank']
-                df = data['df']
-                count = data['count']
-                current_win = data.get('window_size', '?') # Ambil info window size.
-
-                # Menampilkan Header Nama File di area utama.
-                st.subheader(f"📄 File: {selected_file}")
+                df = data.df
+                count = data.count
+                node_count = data.node_count
+                current_win = data.window_size # Ambil info window size.
+
+                # Menampilkan Header Nama File (atau korpus) di area utama.
+                st.subheader(title)
                 # Menampilkan caption untuk konfirmasi ke user bahwa settingan slider berfungsi.
                 st.caption(f"Graph ini dibuat dengan Jarak Hubungan Kata (Window Size): {current_win}")
                 # Menampilkan kotak sukses berisi statistik singkat.
-                st.success(f"Total Kata: {count} | Node Graph: {len(G.nodes())}")
+                st.success(f"Total Kata: {count} | Node Graph: {node_count}")
+                # Telemetri PageRank: berguna untuk menyetel PAGERANK_TOL terhadap waktu tunggu.
+                stats = data.stats
+                st.caption(
+                    f"PageRank: {stats['iterations']} iterasi | residual {stats['residual']:.2e} | "
+                    f"{stats['seconds'] * 1000:.1f} ms" + ("" if stats['converged'] else " (berhenti lebih awal)")
+                )
 
                 # Membagi layar utama menjadi 2 kolom (Kiri 3 bagian, Kanan 2 bagian).
                 col_graph, col_stats = st.columns([3, 2])
@@ -374,39 +2368,12 @@ def main():
                 with col_graph:
                     st.subheader("🕸️ Word Graph")
                     
-                    # Menghitung posisi (x, y) setiap titik agar menyebar rapi (spring layout).
-                    pos = nx.spring_layout(G, k=0.5, seed=42)
-                    
-                    # Membuat kanvas visualisasi menggunakan PyVis.
-                    net = Network(height="600px", width="100%", bgcolor="#ffffff", font_color="black")
-                    # Memasukkan data dari NetworkX ke PyVis.
-                    net.from_nx(G)
-
-                    # Melakukan loop untuk mempercantik setiap node (titik).
-                    for node in net.nodes:
-                        word = node['id']               # Ambil kata (id node).
-                        node['x'] = pos[word][0] * 1000 # Set koordinat X (dikali 1000 biar luas).
-                        node['y'] = pos[word][1] * 1000 # Set koordinat Y.
-                        node['physics'] = False         # Matikan simulasi fisika (biar graph diam/stabil).
-                        
-                        # Ambil skor PageRank kata tersebut.
-                        score = pr.get(word, 0.01)
-                        # Set ukuran node berdasarkan skor (makin penting makin besar).
-                        node['size'] = score * 1000 
-                        # Set tulisan tooltip yang muncul saat mouse diarahkan ke node.
-                        node['title'] = f"Kata: {word}\nRank: {df[df['Kata']==word].index[0]+1}"
-
-                    # Pastikan fisika mati total.
-                    net.toggle_physics(False)
-
                     # Blok try-except untuk merender HTML.
                     try:
-                        path_html = "graph.html"
-                        # Simpan hasil graph ke file HTML sementara.
-                        net.save_graph(path_html)
-                        # Buka file HTML tersebut sebagai teks string.
-                        with open(path_html, 'r', encoding='utf-8') as f:
-                            html_source = f.read()
+                        # HTML dibuat di memori (atau diambil dari cache jika dokumen/window ini pernah digambar).
+                        html_source, shown_nodes = graph_view_html(data, max_nodes)
+                        if shown_nodes < node_count:
+                            st.caption(f"Menampilkan {shown_nodes} dari {node_count} node (PageRank tertinggi).")
                         # Tampilkan string HTML tersebut ke dalam Streamlit.
                         components.html(html_source, height=620)
                     except Exception as e:
@@ -417,7 +2384,7 @@ def main():
                 with col_stats:
                     st.subheader("📊 Top Ranking")
                     # Ambil 20 kata teratas dari dataframe.
-                    top_df = df.head(20)
+                    top_df = df.head(TOP_RANK_DISPLAY)
                     # Tampilkan Bar Chart (Grafik Batang).
                     st.bar_chart(top_df.set_index('Kata')['PageRank'])
                     
@@ -425,19 +2392,40 @@ def main():
                     st.subheader("📋 PageRank")
                     # Tampilkan tabel data lengkap yang bisa di-scroll.
                     st.dataframe(df, use_container_width=True, height=300, hide_index=True)
-        else:
+
+                # Pemakaian memori dokumen sesi ini dibanding batasnya (termasuk Graph & tabel yang baru dibuat).
+                memory_note.caption(f"Memori dokumen: {store.nbytes() / 2**20:.1f} / {store.budget / 2**20:.0f} MB")
+        elif not ingest.pending():
             # Pesan jika belum ada file yang diproses.
             st.info("Belum ada file yang berhasil diproses.")
 
     else:
         # --- KONDISI JIKA USER MENGHAPUS SEMUA FILE (KLIK X DI UPLOADER) ---
+        # Batalkan file yang masih diproses di latar belakang.
+        st.session_state.ingest.cancel_all()
         # Reset memori paper data jadi kosong.
-        st.session_state.paper_data = {}
+        st.session_state.paper_data = DocumentStore()
         # Reset pilihan file aktif jadi None.
         st.session_state.active_file_key = None
         # Tampilkan pesan instruksi awal.
         st.info("Silakan upload file PDF di sidebar.")
 
+    # --- GRAPH EDGE LIST (DI BAWAH ANALISIS PAPER) ---
+    if edge_file is not None or use_edge_sample:
+        render_edge_list_view(edge_file, top_k, max_nodes)
+    else:
+        # File edge list dihapus dari uploader: lepaskan graph-nya dari memori.
+        st.session_state.edge_graph = None
+
+    # --- PANEL DIAGNOSTIK (DI BAGIAN PALING AKHIR, SETELAH SEMUA TAHAP SELESAI) ---
+    if show_diagnostics:
+        store = st.session_state.paper_data
+        names = {doc.digest: name for name, doc in store.documents.items()}
+        names[store.corpus.digest] = "Korpus"
+        if st.session_state.get('edge_graph') is not None:
+            names[st.session_state.edge_graph.digest] = "Edge List"
+        render_diagnostics(run_records, names)
+
 # ==============================================================================
 # ENTRY POINT (TITIK MULAI PROGRAM)
 # ==============================================================================
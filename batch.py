@@ -0,0 +1,196 @@
+# ==============================================================================
+# BATCH: EKSTRAKSI KATA KUNCI TANPA UI (BANYAK PDF SEKALIGUS)
+# ==============================================================================
+#
+# Menjalankan pipeline yang sama dengan app.py (ekstraksi PDF -> pembersihan teks ->
+# co-occurrence -> PageRank) untuk seluruh isi folder atau daftar file (manifest),
+# dibagi ke beberapa proses sekaligus.
+#
+# Contoh pemakaian:
+#   python batch.py arsip_paper/ --output hasil/ --window 2 --workers 8
+#   python batch.py --manifest daftar_pdf.txt --output hasil/ --format parquet
+#
+# Setiap dokumen menghasilkan satu file peringkat (kolom ID, Kata, PageRank) bernama
+# <sidik jari isi PDF>.w<window>.csv / .parquet. Kemajuan dicatat di <output>/progress.jsonl,
+# jadi jika proses mati di tengah jalan, menjalankan perintah yang sama akan melewati
+# file yang sudah selesai.
+#
+# Cache token disimpan di <output>/.ppw_cache (bisa diganti dengan --cache-dir, atau dimatikan dengan
+# --no-cache), terpisah dari cache aplikasi web supaya batch besar tidak menggusur cache pengguna.
+# Log tahap (PPW_STAGE_LOG) milik aplikasi web tidak ditulis oleh batch.
+
+import argparse                         # Membaca argumen dari command line.
+import concurrent.futures               # Pool proses: beberapa dokumen dikerjakan bersamaan.
+import json                             # Menulis catatan kemajuan (progress.jsonl).
+import os                               # Operasi file & folder.
+import sys                              # Menulis pesan kemajuan ke stderr.
+
+import app                              # Memakai ulang fungsi-fungsi pipeline dari aplikasi Streamlit.
+
+# Nama file catatan kemajuan di dalam folder output.
+PROGRESS_FILE = "progress.jsonl"
+# Status yang dianggap "selesai" (tidak dikerjakan ulang saat dilanjutkan).
+DONE_STATUSES = ("ok", "empty")
+
+# ==============================================================================
+# BAGIAN 1: DAFTAR FILE INPUT
+# ==============================================================================
+
+# Mengumpulkan semua file PDF dari sebuah folder (termasuk sub-folder), urut abjad.
+def find_pdfs(directory):
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+# Membaca manifest: satu path PDF per baris (baris kosong dan baris diawali '#' dilewati).
+def read_manifest(manifest_path):
+    with open(manifest_path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+# Membaca progress.jsonl: mengembalikan himpunan path yang sudah selesai diproses
+# dengan pengaturan (window & format) yang sama.
+def load_finished(output_dir, window_size, fmt):
+    finished = set()
+    path = os.path.join(output_dir, PROGRESS_FILE)
+    if not os.path.exists(path):
+        return finished
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Baris terakhir bisa terpotong jika proses mati saat menulis: abaikan.
+                continue
+            if (record.get("status") in DONE_STATUSES
+                    and record.get("window") == window_size and record.get("format") == fmt):
+                finished.add(record["path"])
+    return finished
+
+# ==============================================================================
+# BAGIAN 2: PEKERJAAN PER DOKUMEN (DIJALANKAN DI PROSES WORKER)
+# ==============================================================================
+
+# Dipanggil sekali saat worker dibuat. cache_dir=None berarti tanpa cache.
+def _init_worker(cache_dir):
+    # Paralelisme sudah per dokumen, jadi ekstraksi per halaman di dalam worker dibuat berurutan
+    # (mencegah setiap worker membuat pool proses sendiri).
+    app.PDF_WORKERS = 1
+    # Karena ekstraksi sudah berurutan, semua PDF lewat jalur streaming: memori setiap worker
+    # sebanding dengan kosakata, bukan panjang dokumen (penting untuk buku/prosiding tebal).
+    app.STREAM_MIN_PAGES = 0
+    # Cache token milik batch sendiri (lihat --cache-dir / --no-cache).
+    app.CACHE_DIR = cache_dir or ""
+    # Log tahap aplikasi web tidak diisi oleh batch. Registry dibuat saat tahap pertama berjalan,
+    # jadi cukup dimatikan di sini sebelum ada dokumen yang diproses.
+    app.STAGE_LOG_PATH = None
+
+# Menulis tabel peringkat secara atomik (tulis file sementara, lalu rename).
+def write_table(df, path, fmt):
+    tmp_path = path + ".tmp"
+    if fmt == "parquet":
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+# Memproses satu PDF dan menulis file peringkatnya. Mengembalikan satu record kemajuan (dict).
+def process_pdf(path, output_dir, window_size, fmt, top_n):
+    record = {"path": path, "window": window_size, "format": fmt}
+    try:
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        digest = app.pdf_digest(pdf_bytes)
+        record["digest"] = digest
+
+        # Token diambil dari cache disk batch (jika ada), dibaca bertahap.
+        index = app.load_document_index(pdf_bytes, digest)
+        record["words"] = index.count
+        # Aturan yang sama dengan app.py: teks dengan <= 5 kata dianggap kosong.
+        if index.count <= 5:
+            record["status"] = "empty"
+            return record
+
+        vocab, A = index.vocab, index.matrix(window_size)
+        scores, stats = app.sparse_pagerank(A)
+        df = app.ranking_table(vocab, scores)
+        record["nodes"] = len(df)
+        if top_n:
+            df = df.head(top_n)
+
+        output_path = os.path.join(output_dir, f"{digest}.w{window_size}.{fmt}")
+        write_table(df, output_path, fmt)
+        record.update({
+            "status": "ok",
+            "iterations": stats["iterations"],
+            "output": os.path.basename(output_path),
+        })
+    except Exception as e:
+        # Satu PDF rusak tidak boleh menghentikan seluruh batch; dicatat lalu dicoba lagi di run berikutnya.
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+# ==============================================================================
+# BAGIAN 3: PROGRAM UTAMA
+# ==============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ekstraksi kata kunci (PageRank) untuk banyak PDF tanpa UI.")
+    parser.add_argument("input", nargs="?", help="Folder berisi PDF (dicari sampai ke sub-folder).")
+    parser.add_argument("--manifest", help="File teks berisi daftar path PDF, satu per baris.")
+    parser.add_argument("--output", required=True, help="Folder tujuan file peringkat dan progress.jsonl.")
+    parser.add_argument("--window", type=int, default=1, choices=range(1, app.MAX_WINDOW_SIZE + 1),
+                        help="Jarak hubungan kata (window size), sama seperti slider di aplikasi.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Jumlah proses paralel.")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv",
+                        help="Format file peringkat (parquet membutuhkan pyarrow).")
+    parser.add_argument("--top", type=int, default=0, help="Simpan hanya N kata teratas (0 = semua).")
+    parser.add_argument("--cache-dir", help="Folder cache token (default: <output>/.ppw_cache).")
+    parser.add_argument("--no-cache", action="store_true", help="Jangan membaca/menulis cache token.")
+    args = parser.parse_args(argv)
+    if not args.input and not args.manifest:
+        parser.error("isi folder input atau --manifest")
+    if args.no_cache and args.cache_dir:
+        parser.error("--cache-dir tidak bisa dipakai bersama --no-cache")
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("--format parquet membutuhkan paket pyarrow")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(args.output, exist_ok=True)
+    cache_dir = None if args.no_cache else (args.cache_dir or os.path.join(args.output, ".ppw_cache"))
+
+    paths = read_manifest(args.manifest) if args.manifest else find_pdfs(args.input)
+    # Lewati file yang sudah selesai pada run sebelumnya.
+    finished = load_finished(args.output, args.window, args.format)
+    pending = [path for path in paths if path not in finished]
+    print(f"{len(paths)} PDF, {len(paths) - len(pending)} sudah selesai, {len(pending)} akan diproses.", file=sys.stderr)
+
+    failed = 0
+    with open(os.path.join(args.output, PROGRESS_FILE), "a", encoding="utf-8") as progress, \
+            concurrent.futures.ProcessPoolExecutor(
+                max_workers=args.workers, initializer=_init_worker, initargs=(cache_dir,)) as pool:
+        futures = [
+            pool.submit(process_pdf, path, args.output, args.window, args.format, args.top)
+            for path in pending
+        ]
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            record = future.result()
+            # Catat segera (dan flush) supaya kemajuan tidak hilang jika proses mati.
+            progress.write(json.dumps(record, ensure_ascii=False) + "\n")
+            progress.flush()
+            if record["status"] == "error":
+                failed += 1
+            print(f"[{done}/{len(pending)}] {record['status']:5} {record['path']}", file=sys.stderr)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
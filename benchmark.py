@@ -0,0 +1,234 @@
+# ==============================================================================
+# BENCHMARK: MENGUKUR WAKTU & MEMORI SETIAP TAHAP PIPELINE
+# ==============================================================================
+#
+# Mengukur setiap tahap app.py (ekstraksi PDF, tokenisasi, co-occurrence, PageRank,
+# layout, render HTML) pada PDF sintetis yang ukurannya bisa diatur, ditambah satu kasus
+# graph besar dari facebook_combined.txt (~88 ribu edge).
+#
+# Contoh pemakaian:
+#   python benchmark.py --pages 300 --vocab 5000 --output baseline.json
+#   python benchmark.py --pages 300 --vocab 5000 --compare baseline.json --threshold 0.2
+#
+# Hasil ditulis sebagai JSON. Dengan --compare, median waktu setiap tahap dibandingkan dengan
+# hasil lama; tahap yang lebih lambat dari batas --threshold ditandai sebagai regresi
+# (exit code 1), jadi bisa dipakai di CI.
+
+import argparse                         # Membaca argumen dari command line.
+import json                             # Menulis/membaca hasil benchmark.
+import os                               # Path file.
+import platform                         # Info mesin untuk metadata hasil.
+import random                           # Membuat teks sintetis (dengan seed agar bisa diulang).
+import statistics                       # Median waktu.
+import subprocess                       # Mengukur waktu import app.py di proses Python baru (cold start).
+import sys                              # Menulis laporan ke stderr & exit code.
+import time                             # Mengukur waktu.
+import tracemalloc                      # Mengukur puncak memori Python per tahap.
+
+import fitz  # PyMuPDF                  # Membuat PDF sintetis.
+import networkx as nx                   # Layout graph (sama seperti di aplikasi).
+
+import app                              # Fungsi-fungsi pipeline yang diukur.
+
+# File edge list yang ikut di repository (dipakai untuk kasus graph besar).
+EDGE_LIST_PATH = app.EDGE_LIST_SAMPLE
+
+# ==============================================================================
+# BAGIAN 1: DATA SINTETIS
+# ==============================================================================
+
+# Membuat kosakata buatan: kata-kata acak huruf kecil (panjang 4-10) agar lolos filter process_text.
+def make_vocabulary(size, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+# Membuat PDF sintetis di memori. Frekuensi kata mengikuti distribusi Zipf seperti teks asli
+# (sedikit kata sangat sering muncul, banyak kata jarang).
+def make_pdf(pages, words_per_page, vocab_size, seed=0):
+    rng = random.Random(seed)
+    vocab = make_vocabulary(vocab_size, rng)
+    weights = [1.0 / rank for rank in range(1, vocab_size + 1)]
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        text = " ".join(rng.choices(vocab, weights=weights, k=words_per_page))
+        page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=7)
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+# ==============================================================================
+# BAGIAN 2: PENGUKURAN
+# ==============================================================================
+
+# Menjalankan fungsi beberapa kali: waktu diukur tanpa tracemalloc (agar tidak melambat),
+# lalu satu kali lagi dengan tracemalloc untuk puncak memori. Mengembalikan (hasil, statistik).
+def measure(func, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = {
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+        "peak_mb": peak / (1024 * 1024),
+    }
+    return result, stats
+
+# Program kecil untuk tahap yang hanya bekerja sekali per proses: dijalankan di proses Python baru.
+# `setup` tidak diukur; `stmt` diukur (dengan tracemalloc jika argumen pertama "1").
+# Mencetak {"seconds", "peak"} sebagai JSON di baris terakhir.
+FRESH_PROCESS_TEMPLATE = """
+import json, sys, time, tracemalloc
+{setup}
+trace = sys.argv[1] == "1"
+if trace:
+    tracemalloc.start()
+started = time.perf_counter()
+{stmt}
+seconds = time.perf_counter() - started
+peak = tracemalloc.get_traced_memory()[1] if trace else 0
+print(json.dumps({{"seconds": seconds, "peak": peak}}))
+"""
+
+# Seperti measure(), tetapi setiap pengulangan memakai proses Python baru (misal import yang di-cache
+# setelah pertama kali: di proses yang sama, pengulangan kedua dan seterusnya tidak mengerjakan apa-apa).
+def measure_fresh_process(setup, stmt, repeat, cwd):
+    code = FRESH_PROCESS_TEMPLATE.format(setup=setup, stmt=stmt)
+
+    def run(trace):
+        output = subprocess.run([sys.executable, "-c", code, "1" if trace else "0"],
+                                cwd=cwd, check=True, capture_output=True, text=True).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    timings = [run(False)["seconds"] for _ in range(repeat)]
+    return {
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+        "peak_mb": run(True)["peak"] / (1024 * 1024),
+    }
+
+def run_benchmarks(args):
+    results = {}
+
+    def report(stage, stats):
+        results[stage] = stats
+        print(f"{stage:22} median {stats['seconds_median'] * 1000:10.1f} ms | peak {stats['peak_mb']:8.1f} MB", file=sys.stderr)
+
+    def record(stage, func):
+        result, stats = measure(func, args.repeat)
+        report(stage, stats)
+        return result
+
+    # Cold start: import app.py di proses baru (library berat dimuat malas, jadi ini harus tetap kecil).
+    app_dir = os.path.dirname(os.path.abspath(app.__file__))
+    record("cold_import", lambda: subprocess.run([sys.executable, "-c", "import app"], cwd=app_dir, check=True, capture_output=True))
+    # Memuat library berat yang dimuat malas. Hanya pemanggilan pertama yang bekerja, jadi diukur di proses baru.
+    lazy_modules = ("fitz", "pd", "sp", "nx", "pyvis_network")
+    load_lazy = f"[getattr(app, name).__name__ for name in {lazy_modules!r}]"
+    report("lazy_imports", measure_fresh_process("import app", load_lazy, args.repeat, app_dir))
+    # Di proses ini juga dimuat sekarang, supaya waktunya tidak masuk ke tahap pertama yang memakainya.
+    for name in lazy_modules:
+        getattr(app, name).__name__
+
+    pdf_bytes = make_pdf(args.pages, args.words_per_page, args.vocab, args.seed)
+
+    # Tahap per dokumen, urut seperti di aplikasi.
+    raw_text = record("extract", lambda: app.extract_text_from_bytes(pdf_bytes))
+    words = record("tokenize", lambda: app.process_text(raw_text))
+    vocab, A = record("cooccurrence", lambda: app.build_cooccurrence_matrix(words, args.window))
+    index = record("cooccurrence_index", lambda: app.CooccurrenceIndex(words))
+    # Jalur streaming (halaman -> token -> co-occurrence per potongan): bandingkan peak_mb dengan tahap di atas.
+    record("stream_index", lambda: app.stream_document_index(pdf_bytes))
+    record("index_window_switch", lambda: index.matrix(args.window))
+    scores, _ = record("pagerank", lambda: app.sparse_pagerank(A))
+
+    # Tahap tampilan: Graph yang benar-benar digambar (sudah diringkas sesuai batas node).
+    G = app.cooccurrence_to_networkx(vocab, A)
+    doc = app.CompactDocument(None, len(words), index).rank(args.window)
+    render_G = record("select_render_graph", lambda: app.select_render_graph(G, doc.pagerank, args.max_nodes))
+    pos = record("layout", lambda: nx.spring_layout(render_G, k=0.5, seed=42))
+    record("render_html", lambda: app.render_graph_html(render_G, doc.pagerank, doc.rank_of, pos))
+
+    # Kasus graph besar: PageRank pada facebook_combined.txt.
+    if not args.skip_large and os.path.exists(EDGE_LIST_PATH):
+        large = record("large_graph_load", lambda: app.load_edge_list(EDGE_LIST_PATH))
+        record("large_graph_pagerank", lambda: app.sparse_pagerank(large.adjacency))
+
+    return results
+
+# ==============================================================================
+# BAGIAN 3: PERBANDINGAN DENGAN HASIL LAMA
+# ==============================================================================
+
+# Membandingkan median waktu dengan hasil lama. Mengembalikan daftar tahap yang melambat.
+def compare(results, baseline, threshold):
+    regressions = []
+    for stage, stats in results.items():
+        old = baseline.get("results", {}).get(stage)
+        if not old or old["seconds_median"] <= 0:
+            continue
+        ratio = stats["seconds_median"] / old["seconds_median"]
+        marker = "REGRESI" if ratio > 1 + threshold else ""
+        print(f"{stage:22} {old['seconds_median'] * 1000:10.1f} -> {stats['seconds_median'] * 1000:10.1f} ms ({ratio:5.2f}x) {marker}", file=sys.stderr)
+        if marker:
+            regressions.append(stage)
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark setiap tahap pipeline app.py.")
+    parser.add_argument("--pages", type=int, default=100, help="Jumlah halaman PDF sintetis.")
+    parser.add_argument("--words-per-page", type=int, default=400, help="Jumlah kata per halaman.")
+    parser.add_argument("--vocab", type=int, default=3000, help="Ukuran kosakata sintetis.")
+    parser.add_argument("--window", type=int, default=2, help="Window size co-occurrence.")
+    parser.add_argument("--max-nodes", type=int, default=app.GRAPH_NODE_BUDGET, help="Batas node yang digambar.")
+    parser.add_argument("--repeat", type=int, default=3, help="Berapa kali setiap tahap diulang.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed data sintetis.")
+    parser.add_argument("--skip-large", action="store_true", help="Lewati kasus graph besar (facebook_combined.txt).")
+    parser.add_argument("--output", help="Simpan hasil ke file JSON ini (default: stdout).")
+    parser.add_argument("--compare", help="File JSON hasil lama untuk dibandingkan.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Batas perlambatan relatif (0.2 = 20%%).")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(args)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regresi: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# ==============================================================================
+# PACK RESOURCES: MEMBUAT ARTEFAK RESOURCE BAHASA UNTUK SERVER TANPA INTERNET
+# ==============================================================================
+#
+# app.py membaca stopwords Bahasa Indonesia dan mode tokenizer dari nlp_resources.json,
+# jadi server (atau container) tidak perlu NLTK data maupun koneksi internet saat start.
+# Script ini membuat ulang file tersebut dari data NLTK, dijalankan sekali di mesin yang
+# punya internet (misal saat build image), lalu hasilnya ikut di-deploy.
+#
+# Contoh pemakaian:
+#   python pack_resources.py --download
+#   python pack_resources.py --output /opt/ppw/nlp_resources.json   (lalu PPW_NLP_RESOURCES=/opt/ppw/nlp_resources.json)
+
+import argparse                         # Membaca argumen dari command line.
+import sys                              # Menulis pesan ke stderr & exit code.
+
+import app                              # Fungsi pembuat artefak (pack_nlp_resources) ada di aplikasi.
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Membuat nlp_resources.json dari data NLTK.")
+    parser.add_argument("--output", default=app.NLP_RESOURCES_PATH, help="Lokasi file artefak.")
+    parser.add_argument("--download", action="store_true",
+                        help="Unduh data NLTK (stopwords, punkt, punkt_tab) yang belum terpasang terlebih dahulu.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.download:
+        app.download_nltk_data()
+
+    resources = app.nltk_nlp_resources()
+    if not resources["stopwords"]:
+        # Artefak tanpa stopwords membuat hasil PageRank berbeda: jangan timpa artefak yang ada.
+        print("Stopwords NLTK 'indonesian' tidak ditemukan; jalankan dengan --download.", file=sys.stderr)
+        return 1
+
+    packed = app.pack_nlp_resources(args.output, resources)
+    stop_words = packed["stopwords"]["indonesian"]
+    print(f"{args.output}: {len(stop_words)} stopwords, split_contractions={packed['split_contractions']}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+# Tes dijalankan dari folder mana pun: app.py ada di folder induk.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Tes tidak menulis ke log tahap aplikasi (lihat STAGE_LOG_PATH di app.py).
+os.environ.setdefault("PPW_STAGE_LOG", "")
@@ -0,0 +1,22 @@
+# Tes pembaca edge list (BAGIAN 13 app.py): setiap baris harus berisi tepat dua ID node.
+
+import pytest
+
+import app
+
+@pytest.mark.parametrize("chunk_bytes", [1, 4, app.EDGE_CHUNK_BYTES])
+def test_parses_lines_comments_and_blank_lines(chunk_bytes):
+    graph = app.load_edge_list(b"# header SNAP\n1 2\n\n  \n3\t4\r\n12345 1 # komentar\n", chunk_bytes)
+    assert graph.vocab.tolist() == [1, 2, 3, 4, 12345]
+    assert graph.edge_count == 3
+
+@pytest.mark.parametrize("data", [b"", b"  \n", b"# hanya komentar\n", b"1 2\n\n\n\n\n"])
+def test_empty_chunks(data):
+    graph = app.load_edge_list(data, chunk_bytes=4)
+    assert graph.edge_count == (1 if data.startswith(b"1") else 0)
+
+@pytest.mark.parametrize("data", [b"1 2 5\n3 4 7\n", b"1 2\n3\n4 5\n", b"1 2\n3 4 5\n", b"1 x\n"])
+@pytest.mark.parametrize("chunk_bytes", [4, app.EDGE_CHUNK_BYTES])
+def test_rejects_lines_without_exactly_two_ids(data, chunk_bytes):
+    with pytest.raises(ValueError, match="tepat dua ID node"):
+        app.load_edge_list(data, chunk_bytes)
@@ -0,0 +1,187 @@
+# Tes kesetaraan: setiap jalur cepat di app.py harus memberi hasil yang sama persis dengan
+# implementasi awal (process_text berbasis regex + word_tokenize NLTK, dan build_graph berbasis dict).
+
+import random
+import re
+
+import fitz  # PyMuPDF
+import numpy as np
+import pytest
+from nltk.tokenize import NLTKWordTokenizer
+
+import app
+
+# ==============================================================================
+# IMPLEMENTASI AWAL (ACUAN)
+# ==============================================================================
+
+_nltk_tokenizer = NLTKWordTokenizer()
+
+# process_text versi awal. word_tokenize = sent_tokenize (Punkt) + NLTKWordTokenizer; setelah semua
+# tanda baca dibuang, Punkt tidak pernah memecah kalimat, jadi cukup NLTKWordTokenizer saja.
+def reference_process_text(text, stop_words):
+    text = re.sub(r'\d+', '', text)
+    text = re.sub(r'[^\w\s]', '', text)
+    text = text.lower()
+    words = _nltk_tokenizer.tokenize(text)
+    return [word for word in words if word.isalpha() and word not in stop_words and len(word) > 2]
+
+# build_graph versi awal, tetapi mengembalikan dict {(kata, kata): bobot} supaya mudah dibandingkan.
+def reference_cooccurrences(words, window_size=2):
+    co_occurrences = {}
+    for i in range(len(words) - window_size):
+        target = words[i]
+        for neighbor in words[i + 1:i + 1 + window_size]:
+            if target == neighbor:
+                continue
+            pair = tuple(sorted((target, neighbor)))
+            co_occurrences[pair] = co_occurrences.get(pair, 0) + 1
+    return co_occurrences
+
+# Matriks co-occurrence (vocab, A) -> dict {(kata, kata): bobot} seperti reference_cooccurrences.
+def matrix_pairs(vocab, A):
+    upper = app.sp.triu(A, k=1).tocoo()
+    pairs = {}
+    for row, col, weight in zip(upper.row, upper.col, upper.data):
+        if weight:
+            pairs[tuple(sorted((vocab[row], vocab[col])))] = int(weight)
+    return pairs
+
+# ==============================================================================
+# DATA UJI
+# ==============================================================================
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    return app.TextTokenizer({'stopwords': app.get_nlp_resources()['stopwords'], 'split_contractions': True})
+
+# Potongan teks acak: kata biasa, stopword, angka, tanda baca, kontraksi NLTK, huruf 'İ' (menjadi
+# 'i' + U+0307 setelah lower()), dan berbagai spasi.
+PIECES = [
+    "graph", "Graph", "kata", "jaringan", "sosial", "yang", "dan", "data", "pagerank", "ab", "x",
+    "cannot", "CANNOT", "gimme", "gonna", "gotta", "lemme", "wanna", "Wanna", "can", "not",
+    "İ", "İcannot", "İSTANBUL", "I", "i", "é", "naïve", "ß", "ǅ",
+    " ", " ", " ", "\n", "\t", "\r\n", " ", ".", ",", "'", "\"", "-", "(", ")", "1", "2024", "3.5",
+]
+
+def random_text(rng, pieces=12):
+    return "".join(rng.choice(PIECES) for _ in range(rng.randint(0, pieces)))
+
+def random_words(rng, length, vocab=6):
+    return [f"w{rng.randrange(vocab)}" for _ in range(length)]
+
+# ==============================================================================
+# TOKENIZER (user-006)
+# ==============================================================================
+
+@pytest.mark.parametrize("text", [
+    "İcannot x", "xİgonna y", "wannaİ", "İwanna", "gİmme", "CANNOTİ wanna", "İİcannot",
+    "abİcannot1gottaİnotİgimme", "cannot gimme gonna gotta lemme wanna",
+])
+def test_tokenizer_contraction_cases(tokenizer, text):
+    assert list(tokenizer.tokenize(text)) == reference_process_text(text, tokenizer.stop_words)
+
+def test_tokenizer_random_texts(tokenizer):
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = random_text(rng)
+        assert list(tokenizer.tokenize(text)) == reference_process_text(text, tokenizer.stop_words), repr(text)
+
+# Potongan kecil memaksa banyak batas potongan (iter_chunks) di tengah teks.
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_tokenizer_chunk_boundaries(tokenizer, monkeypatch, chunk_size):
+    monkeypatch.setattr(tokenizer, "CHUNK_SIZE", chunk_size)
+    rng = random.Random(chunk_size)
+    for _ in range(150):
+        text = random_text(rng, pieces=80)
+        assert list(tokenizer.tokenize(text)) == reference_process_text(text, tokenizer.stop_words), repr(text)
+
+# tokenize_pages (halaman PDF bertahap) == tokenize(gabungan semua halaman).
+def test_tokenize_pages_matches_whole_text(tokenizer, monkeypatch):
+    monkeypatch.setattr(tokenizer, "CHUNK_SIZE", 16)
+    rng = random.Random(1)
+    for _ in range(150):
+        text = random_text(rng, pieces=60)
+        cuts = sorted(rng.randrange(len(text) + 1) for _ in range(rng.randint(0, 6)))
+        pages = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        streamed = [word for words in tokenizer.tokenize_pages(pages) for word in words]
+        assert streamed == list(tokenizer.tokenize(text)), repr(pages)
+
+# ==============================================================================
+# CO-OCCURRENCE (user-003, user-004, user-017)
+# ==============================================================================
+
+# Termasuk dokumen yang lebih pendek dari window (tidak ada pasangan sama sekali) dan kata berulang.
+WORD_LISTS = [[], ["a"], ["a", "b"], ["a", "a", "a"], ["a", "b", "a", "b", "c"]] + [
+    random_words(random.Random(seed), length) for seed, length in enumerate([3, 4, 5, 6, 7, 50, 400])
+]
+
+@pytest.mark.parametrize("words", WORD_LISTS)
+@pytest.mark.parametrize("window_size", range(1, app.MAX_WINDOW_SIZE + 1))
+def test_build_graph_matches_reference(words, window_size):
+    expected = reference_cooccurrences(words, window_size)
+    vocab, A = app.build_cooccurrence_matrix(words, window_size)
+    assert matrix_pairs(vocab, A) == expected
+    G = app.build_graph(words, window_size)
+    assert {tuple(sorted((u, v))): w for u, v, w in G.edges(data='weight')} == expected
+
+@pytest.mark.parametrize("words", WORD_LISTS)
+def test_index_matches_reference_for_every_window(words):
+    index = app.CooccurrenceIndex(words)
+    for window_size in range(1, app.MAX_WINDOW_SIZE + 1):
+        assert matrix_pairs(index.vocab, index.matrix(window_size)) == reference_cooccurrences(words, window_size)
+
+# Streaming: kata masuk per potongan acak (termasuk potongan kosong dan satu kata), dengan
+# penampung pasangan yang sering digabung (FLUSH_PAIRS kecil).
+@pytest.mark.parametrize("words", WORD_LISTS)
+def test_streaming_counter_matches_reference(words, monkeypatch):
+    monkeypatch.setattr(app.CooccurrenceCounter, "FLUSH_PAIRS", 3)
+    rng = random.Random(len(words))
+    for _ in range(10):
+        cuts = sorted(rng.randrange(len(words) + 1) for _ in range(rng.randint(0, 8)))
+        chunks = [words[a:b] for a, b in zip([0] + cuts, cuts + [len(words)])]
+        index = app.CooccurrenceIndex.from_chunks(chunks)
+        assert index.count == len(words)
+        for window_size in range(1, app.MAX_WINDOW_SIZE + 1):
+            assert matrix_pairs(index.vocab, index.matrix(window_size)) == reference_cooccurrences(words, window_size)
+
+# PDF sintetis: jalur streaming (dan muat ulang dari cache disk) == jalur biasa == acuan.
+def test_stream_document_index_matches_batch_path(tokenizer, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(app, "PDF_WORKERS", 1)
+    rng = random.Random(2)
+    doc = fitz.open()
+    for _ in range(12):
+        text = " ".join(random_text(rng, pieces=40) for _ in range(8))
+        doc.new_page().insert_textbox(fitz.Rect(36, 36, 560, 800), text, fontsize=8)
+    pdf_bytes = doc.tobytes()
+
+    words = reference_process_text(app.extract_text_from_bytes(pdf_bytes), app.get_tokenizer().stop_words)
+    assert len(words) > 100
+    streamed = app.stream_document_index(pdf_bytes)
+    cached = app.load_document_index(pdf_bytes)
+    for index in (streamed, cached):
+        assert index.count == len(words)
+        for window_size in range(1, app.MAX_WINDOW_SIZE + 1):
+            assert matrix_pairs(index.vocab, index.matrix(window_size)) == reference_cooccurrences(words, window_size)
+
+# ==============================================================================
+# KORPUS (user-013)
+# ==============================================================================
+
+def test_corpus_matches_sum_of_documents():
+    rng = random.Random(3)
+    papers = {f"paper{i}": random_words(rng, rng.randint(0, 60), vocab=10) for i in range(5)}
+    corpus = app.CorpusIndex()
+    indexes = {name: app.CooccurrenceIndex(words) for name, words in papers.items()}
+    for name, index in indexes.items():
+        corpus.add(name, name, index)
+    corpus.remove("paper2", indexes["paper2"])
+    for window_size in range(1, app.MAX_WINDOW_SIZE + 1):
+        expected = {}
+        for name, words in papers.items():
+            if name == "paper2":
+                continue
+            for pair, weight in reference_cooccurrences(words, window_size).items():
+                expected[pair] = expected.get(pair, 0) + weight
+        assert matrix_pairs(corpus.vocab, corpus.matrix(window_size)) == expected
@@ -0,0 +1,62 @@
+# Tes PageRank (BAGIAN 9 app.py): syarat berhenti sparse_pagerank menjamin setiap skor berjarak < tol
+# dari solusi sebenarnya, dari vektor awal apa pun, jadi warm start tidak mengubah hasil (di luar tol).
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import app
+
+TOL = app.PAGERANK_TOL
+
+# Graph co-occurrence sintetis dengan frekuensi kata ala Zipf (seperti teks asli).
+def make_index(seed=0, size=20000):
+    rng = np.random.default_rng(seed)
+    ranks = rng.zipf(1.3, size)
+    return app.CooccurrenceIndex([f"kata{rank}" for rank in ranks if rank < 3000])
+
+# Solusi "sebenarnya": iterasi sampai selisihnya jauh di bawah tol.
+def reference(A):
+    scores, stats = app.sparse_pagerank(A, tol=1e-14, max_iter=2000)
+    assert stats['converged']
+    return scores
+
+def test_any_start_lands_within_tol():
+    A = make_index().matrix(2)
+    exact = reference(A)
+    rng = np.random.default_rng(1)
+    for nstart in (None, rng.random(A.shape[0]), np.eye(1, A.shape[0], 3).ravel()):
+        scores, stats = app.sparse_pagerank(A, nstart=nstart)
+        assert stats['converged']
+        assert np.abs(scores - exact).max() < TOL
+
+@pytest.mark.parametrize("windows", [(1, 2), (3, 1, 2), (2, 3, 2)])
+def test_warm_start_matches_cold_start(windows):
+    index = make_index(seed=2)
+    doc = app.CompactDocument("warm", index.count, index)
+    for window_size in windows:
+        doc.rank(window_size)
+    cold = app.CompactDocument("cold", index.count, index).rank(windows[-1])
+    # Skor disimpan sebagai float32, jadi ada tambahan galat pembulatan kecil.
+    assert np.abs(doc.scores - cold.scores).max() < 2 * TOL + 1e-7
+    assert np.abs(doc.scores - reference(index.matrix(windows[-1]))).max() < TOL + 1e-7
+
+def test_close_to_networkx():
+    A = make_index(seed=3).matrix(1)
+    G = app.cooccurrence_to_networkx(np.arange(A.shape[0]), A)
+    expected = nx.pagerank(G, alpha=app.PAGERANK_ALPHA, tol=1e-14, max_iter=2000, weight='weight')
+    scores, _ = app.sparse_pagerank(A)
+    assert max(abs(scores[node] - value) for node, value in expected.items()) < TOL
+
+# Korpus: setelah paper ditambah/dihapus, PageRank dimulai dari skor korpus sebelumnya (kosakata
+# korpus hanya bertambah) dan hasilnya tetap sama dengan korpus yang dihitung dari awal.
+def test_corpus_warm_start_matches_cold_start():
+    store = app.DocumentStore(budget=1 << 40)
+    for seed in range(3):
+        index = make_index(seed=10 + seed, size=5000)
+        store.add(f"paper{seed}", app.CompactDocument(f"digest{seed}", index.count, index).rank(2))
+        store.open_corpus(2)
+    store.remove("paper1")
+    warm = store.open_corpus(2)
+    cold = app.CompactDocument("cold", store.corpus.count, store.corpus).rank(2)
+    assert np.abs(warm.scores - cold.scores).max() < 2 * TOL + 1e-7